@@ -14,7 +14,7 @@ CLI entry:
 """
 from .analyzer import TechDetector, detect_technologies
 from .har import parse_har_file
-from .storage import list_detections, save_detection
+from .storage import list_detections, save_detection, save_detections
 # Web app is optional; import lazily when available.
 try:  # pragma: no cover - optional
     from .web import app  # FastAPI app
@@ -27,5 +27,6 @@ __all__ = [
     "parse_har_file",
     "app",
     "save_detection",
+    "save_detections",
     "list_detections",
 ]
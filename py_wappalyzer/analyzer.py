@@ -6,43 +6,236 @@ technologies metadata and inputs from a HAR or manual inputs.
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Match,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from bs4 import BeautifulSoup
 
-from .data_loader import ensure_fingerprint_data, load_categories, load_groups, load_technologies
+try:  # pragma: no cover - optional dependency (speedups extra)
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+from .data_loader import (
+    ensure_fingerprint_data,
+    load_categories,
+    load_compiled_cache,
+    load_groups,
+    load_technologies,
+    save_compiled_cache,
+)
 from .har import parse_har_file
+from .prefilter import (
+    HyperscanPrefilter,
+    build_literal_index,
+    build_prefilter,
+    cache_signature,
+    case_folded_pattern,
+    fold_case,
+)
 
 logger = logging.getLogger(__name__)
 
+# A version template such as "\1.\2" pre-split into alternating literal
+# text and capture group numbers: ("", 1, ".", 2, "").
+VersionTemplate = Tuple[Union[str, int], ...]
+# A compiled pattern list holds (regex, version_template) pairs; the
+# template is only set for dict-shaped pattern maps (pattern -> version).
+# Regexes compiled without re.IGNORECASE expect fold_case()d text.
+CompiledPatterns = List[Tuple[Pattern[str], Optional[VersionTemplate]]]
+# Header/cookie/meta patterns flattened to (name, match_tag, regex,
+# version_template), with the entries of one name kept adjacent; the match
+# tag ("headers:server") is built and interned once at compile time.
+KeyedPatterns = List[Tuple[str, str, Pattern[str], Optional[VersionTemplate]]]
+
+# Fields whose value is a pattern (or list/dict of patterns) vs. fields
+# keyed by a header/cookie/meta name.
+_FLAT_FIELDS = ("url", "html", "scripts", "certIssuer")
+_KEYED_FIELDS = ("headers", "cookies", "meta")
+# Bulk-text fields worth a multi-pattern prefilter scan (see prefilter.py);
+# keyed values are short and only probed when the named key is present.
+_PREFILTER_FIELDS = ("url", "html", "scripts")
+# Technologies handed to a worker per task when analyzing in parallel.
+_PARALLEL_CHUNK = 64
+# Wappalyzer tags appended to a pattern ("\;version:\1", "\;confidence:50").
+_SEMI_RE = re.compile(r"\\;.*$")
+# Group references ("\1") in version templates.
+_TEMPLATE_RE = re.compile(r"\\(\d+)")
+# Plain int: `regex.flags & re.IGNORECASE` would go through enum.Flag.
+_IGNORECASE = int(re.IGNORECASE)
+# Ten matches already clamp confidence to 100; see _analyze_one().
+_SATURATED_MATCHES = 10
+# Bump when the layout of the cached accelerator state changes.
+_ACCELERATOR_CACHE_VERSION = 4
+
+
+class _TechPatterns(NamedTuple):
+    """Compiled patterns of one technology, one flat list per field.
+
+    DNS patterns stay grouped by record type, since every record value is
+    matched (and counted) separately.
+    """
+
+    url: CompiledPatterns
+    html: CompiledPatterns
+    scripts: CompiledPatterns
+    certIssuer: CompiledPatterns
+    headers: KeyedPatterns
+    cookies: KeyedPatterns
+    meta: KeyedPatterns
+    # (record_type, match_tag, patterns)
+    dns: List[Tuple[str, str, CompiledPatterns]]
+
+
+class _Inputs(NamedTuple):
+    """Normalized analyze() inputs shared read-only by per-tech checks."""
+
+    url: str
+    html: str
+    # (script, fold_case(script), live patterns) for every page
+    # `<script src>` URL, then every HAR-derived script.
+    scripts: List[Tuple[str, Optional[str], Optional[Set[Pattern[str]]]]]
+    headers: Dict[str, str]
+    cookies: Dict[str, str]
+    meta: Dict[str, str]
+    dns: Dict[str, List[str]]
+    certIssuer: str
+    # (field, text) -> patterns that may match, from the prefilter scans.
+    live: Dict[Tuple[str, str], Optional[Set[Pattern[str]]]]
+    # text -> fold_case(text) for every input text.
+    folded: Dict[str, str]
+
+
+def _extract_html_tags(html: str) -> Tuple[List[str], Dict[str, str]]:
+    """Return `<script src>` URLs and `<meta>` name -> content pairs.
+
+    Uses selectolax's C-backed lexbor parser when installed, which skips
+    building a BeautifulSoup object tree just to read two tag types.
+    """
+    script_srcs: List[str] = []
+    meta: Dict[str, str] = {}
+
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        script_srcs = [
+            node.attributes.get("src") or "" for node in tree.css("script[src]")
+        ]
+        tags = [node.attributes for node in tree.css("meta")]
+    else:
+        soup: Optional[BeautifulSoup] = None
+        for parser in ("lxml", "html.parser"):
+            try:
+                soup = BeautifulSoup(html, parser)
+                break
+            except Exception:
+                continue
+        if soup is None:
+            return script_srcs, meta
+        script_srcs = [
+            tag.get("src", "") or "" for tag in soup.find_all("script", src=True)
+        ]
+        tags = [tag.attrs for tag in soup.find_all("meta")]
+
+    for attrs in tags:
+        name = attrs.get("name") or attrs.get("property") or attrs.get("http-equiv")
+        content = attrs.get("content")
+        if name and content:
+            meta[name] = content
+    return script_srcs, meta
+
 
 class TechDetector:
     """Technology detector using webappanalyzer data.
 
     Designed for reuse; instantiate once if analyzing many inputs.
+
+    Parameters
+    ----------
+    max_workers: Optional[int]
+        Check technologies on a thread pool of this size. Off by default:
+        CPython's `re` holds the GIL while matching, so threads only pay
+        off on free-threaded builds.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: Optional[int] = None) -> None:
         ensure_fingerprint_data()
         self.technologies = load_technologies()
         self.categories = load_categories()
         self.groups = load_groups()
         self.detected: Dict[str, Dict[str, Any]] = {}
+        # Category/group id -> name lookups for _format_results(), resolved
+        # once; ids are matched by their string form as in the JSON keys.
+        self._category_names: Dict[str, str] = {}
+        self._category_groups: Dict[str, List[Any]] = {}
+        for cat_id, cat_info in self.categories.items():
+            if isinstance(cat_info, dict):
+                self._category_names[cat_id] = cat_info.get("name", f"Category {cat_id}")
+                self._category_groups[cat_id] = list(cat_info.get("groups", []))
+        self._group_names: Dict[str, str] = {
+            grp_id: grp_info.get("name", f"Group {grp_id}")
+            for grp_id, grp_info in self.groups.items()
+            if isinstance(grp_info, dict)
+        }
+        self._labels: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        # Compile every fingerprint regex once up front; analyze() then only
+        # runs prebuilt patterns instead of re-parsing strings per input.
+        self._compiled = self._compile_technologies(self.technologies)
+        # Index-aligned per-technology arrays walked by analyze(), in data
+        # order, so the hot loop does no per-tech dict lookups.
+        self._tech_names: List[str] = list(self._compiled)
+        self._tech_patterns: List[_TechPatterns] = list(self._compiled.values())
+        self._tech_cats: List[Any] = [
+            self.technologies[tech_name].get("cats", [])
+            for tech_name in self._tech_names
+        ]
+        # Match count after which a technology is no longer checked; ones
+        # that can report versions are always checked in full.
+        self._tech_limits: List[int] = [
+            sys.maxsize
+            if any(template for _, template in self._iter_compiled(tech))
+            else _SATURATED_MATCHES
+            for tech in self._tech_patterns
+        ]
+        # Whether any technology reads page <script src> URLs / <meta> tags.
+        self._uses_scripts = any(tech.scripts for tech in self._tech_patterns)
+        self._uses_meta = any(tech.meta for tech in self._tech_patterns)
+        self._load_accelerators()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if max_workers is not None and max_workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
 
     # Public APIs -------------------------------------------------
     def analyze_har(self, har_path: str) -> List[Dict[str, Any]]:
         """Analyze a HAR file path and return detected technologies."""
         logger.info("Analyzing HAR file: %s", har_path)
-        data = parse_har_file(har_path)
+        return self.analyze_har_data(parse_har_file(har_path))
+
+    def analyze_har_data(self, har_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Analyze a HAR already parsed with `parse_har_file`."""
         return self.analyze(
-            url=data["url"],
-            html=data["html"],
-            headers=data["headers"],
-            cookies=data["cookies"],
-            scripts=data["scripts"],
-            meta=data["meta"],
+            url=har_data["url"],
+            html=har_data["html"],
+            headers=har_data["headers"],
+            cookies=har_data["cookies"],
+            scripts=har_data["scripts"],
+            meta=har_data["meta"],
         )
 
     def analyze_json(self, json_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -75,209 +268,567 @@ class TechDetector:
     ) -> List[Dict[str, Any]]:
         """Analyze inputs and return a list of detected technologies."""
         self.detected = {}
-        headers = headers or {}
+        # HTTP header names are case-insensitive; fingerprint header names
+        # are lowercased at compile time, so one lookup per name suffices.
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
         cookies = cookies or {}
         scripts = scripts or []
         meta = meta or {}
         dns = dns or {}
 
-        soup: Optional[BeautifulSoup] = None
+        # Script sources and meta tags are read from the HTML once; explicit
+        # `meta` entries take precedence over the ones found in the page.
+        # The parse is skipped when the page has no tag that any technology
+        # could use (e.g. JSON or plain-text responses).
+        html_folded = fold_case(html) if html else ""
+        script_srcs: List[str] = []
+        if (self._uses_scripts and "<script" in html_folded) or (
+            self._uses_meta and "<meta" in html_folded
+        ):
+            script_srcs, html_meta = _extract_html_tags(html)
+            if html_meta:
+                meta = {**html_meta, **meta}
+
+        # Scan each bulk text once with the optional prefilter up front, so
+        # the per-tech checks below only read shared state.
+        live: Dict[Tuple[str, str], Optional[Set[Pattern[str]]]] = {}
+        self._live_patterns("url", url, live)
+        self._live_patterns("html", html, live)
+        for script in script_srcs + scripts:
+            self._live_patterns("scripts", script, live)
+
+        # Lowercase every text once for the case-folded patterns.
+        texts = [url, certIssuer, *script_srcs, *scripts]
+        texts.extend(headers.values())
+        texts.extend(cookies.values())
+        texts.extend(meta.values())
+        for values in dns.values():
+            texts.extend(values)
+        folded = {
+            text: fold_case(text) for text in texts if text and isinstance(text, str)
+        }
         if html:
-            for parser in ("lxml", "html.parser"):
-                try:
-                    soup = BeautifulSoup(html, parser)
-                    break
-                except Exception:
-                    continue
-
-        for tech_name, tech_data in self.technologies.items():
-            if not isinstance(tech_data, dict):
-                continue
+            folded[html] = html_folded
 
-            matches: List[str] = []
-            versions: set[str] = set()
+        # Per-script state is resolved here once rather than per technology.
+        script_items = [
+            (script, folded.get(script), live.get(("scripts", script)))
+            for script in script_srcs + scripts
+        ]
 
-            # URL
-            if url and "url" in tech_data:
-                if self._check_pattern(url, tech_data["url"]):
-                    matches.append("url")
+        inputs = _Inputs(
+            url, html, script_items, headers, cookies, meta, dns, certIssuer,
+            live, folded,
+        )
+        candidates = self._candidate_technologies(
+            url, html, script_srcs, headers, cookies, scripts, meta, dns,
+            certIssuer,
+        )
+        tech_names = self._tech_names
+        indices: Sequence[int] = range(len(tech_names))
+        if candidates is not None:
+            indices = [i for i in indices if tech_names[i] in candidates]
+
+        if self._executor is None:
+            for i in indices:
+                detection = self._analyze_one(i, inputs)
+                if detection is not None:
+                    self.detected[tech_names[i]] = detection
+        else:
+            chunks = [
+                indices[start:start + _PARALLEL_CHUNK]
+                for start in range(0, len(indices), _PARALLEL_CHUNK)
+            ]
+            # map() yields in submission order, keeping results stable.
+            for chunk_result in self._executor.map(
+                lambda chunk: self._analyze_chunk(chunk, inputs), chunks
+            ):
+                self.detected.update(chunk_result)
 
-            # HTML
-            if html and "html" in tech_data:
-                matched, version = self._check_pattern_with_version(html, tech_data["html"])  # noqa: E501
-                if matched:
-                    matches.append("html")
-                    if version:
-                        versions.add(version)
+        return self._format_results()
 
-            # Scripts in HTML
-            if soup and "scripts" in tech_data:
-                for script_tag in soup.find_all("script", src=True):
-                    src = script_tag.get("src", "") or ""
-                    matched, version = self._check_pattern_with_version(src, tech_data["scripts"])  # noqa: E501
-                    if matched:
-                        matches.append("scripts")
+    def _analyze_chunk(
+        self, indices: Sequence[int], inputs: _Inputs
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run _analyze_one over a slice of technology indices."""
+        detected: Dict[str, Dict[str, Any]] = {}
+        for i in indices:
+            detection = self._analyze_one(i, inputs)
+            if detection is not None:
+                detected[self._tech_names[i]] = detection
+        return detected
+
+    def _analyze_one(self, index: int, inputs: _Inputs) -> Optional[Dict[str, Any]]:
+        """Check the technology at `index` against the inputs.
+
+        Only reads `inputs` and the compiled patterns, so it is safe to run
+        concurrently for different technologies.
+        """
+        tech = self._tech_patterns[index]
+        url, html = inputs.url, inputs.html
+        live, folded = inputs.live, inputs.folded
+        matches: List[str] = []
+        versions: set[str] = set()
+        # Once confidence is clamped at 100 further matches change nothing
+        # for a technology without version templates, so stop checking it.
+        # Cheap fields are probed first, the bulk HTML and scripts last.
+        limit = self._tech_limits[index]
+
+        # URL
+        if url and tech.url:
+            if self._check_pattern(url, tech.url, live.get(("url", url)), folded.get(url)):  # noqa: E501
+                matches.append("url")
+
+        # Headers, cookies and meta: the first matching pattern of a name
+        # counts (and provides the version); later ones for it are skipped.
+        for values, patterns in (
+            (inputs.headers, tech.headers),
+            (inputs.cookies, tech.cookies),
+            (inputs.meta, tech.meta),
+        ):
+            if not values or not patterns:
+                continue
+            done = None
+            for name, tag, regex, template in patterns:
+                if name == done:
+                    continue
+                value = values.get(name)
+                if not value:
+                    continue
+                match = regex.search(value if regex.flags & _IGNORECASE else folded[value])  # noqa: E501
+                if match:
+                    done = name
+                    matches.append(tag)
+                    if template is not None:
+                        version = self._render_version(template, match, value)
                         if version:
                             versions.add(version)
 
-            # External/inline scripts (HAR-derived)
-            if scripts and "scripts" in tech_data:
-                for script in scripts:
-                    matched, version = self._check_pattern_with_version(script, tech_data["scripts"])  # noqa: E501
-                    if matched:
-                        matches.append("scripts")
-                        if version:
-                            versions.add(version)
+        # DNS
+        dns = inputs.dns
+        if dns and tech.dns:
+            for record_type, tag, record_patterns in tech.dns:
+                record_values = dns.get(record_type.upper(), [])
+                for record_value in record_values:
+                    if self._check_pattern(record_value, record_patterns, None, folded.get(record_value)):  # noqa: E501
+                        matches.append(tag)
+
+        # Certificate issuer
+        certIssuer = inputs.certIssuer
+        if certIssuer and tech.certIssuer:
+            if self._check_pattern(certIssuer, tech.certIssuer, None, folded.get(certIssuer)):  # noqa: E501
+                matches.append("certIssuer")
+
+        if len(matches) >= limit:
+            return self._detection(index, matches, versions)
+
+        # HTML
+        if html and tech.html:
+            matched, version = self._check_pattern_with_version(html, tech.html, live.get(("html", html)), folded.get(html))  # noqa: E501
+            if matched:
+                matches.append("html")
+                if version:
+                    versions.add(version)
+
+        # Scripts in HTML, then external/inline scripts (HAR-derived)
+        patterns = tech.scripts
+        if patterns:
+            check = self._check_pattern_with_version
+            for script, script_folded, script_live in inputs.scripts:
+                if script_live is not None and not script_live:
+                    continue
+                matched, version = check(script, patterns, script_live, script_folded)
+                if matched:
+                    matches.append("scripts")
+                    if version:
+                        versions.add(version)
+                    if len(matches) >= limit:
+                        break
+
+        return self._detection(index, matches, versions)
+
+    def _detection(
+        self, index: int, matches: List[str], versions: Set[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Build the per-technology detection record, or None if unmatched."""
+        if not matches:
+            return None
+        return {
+            "versions": list(versions),
+            "confidence": min(len(matches) * 10, 100),
+            "matches": matches,
+            "categories": self._tech_cats[index],
+        }
 
-            # Headers
-            if headers and "headers" in tech_data:
-                for header_name, header_patterns in tech_data["headers"].items():
-                    header_value = (
-                        headers.get(header_name)
-                        or headers.get(header_name.lower())
-                        or ""
-                    )
-                    if header_value:
-                        matched, version = self._check_pattern_with_version(header_value, header_patterns)  # noqa: E501
-                        if matched:
-                            matches.append(f"headers:{header_name}")
-                            if version:
-                                versions.add(version)
-
-            # Cookies
-            if cookies and "cookies" in tech_data:
-                for cookie_name, cookie_patterns in tech_data["cookies"].items():
-                    cookie_value = cookies.get(cookie_name, "")
-                    if cookie_value and self._check_pattern(cookie_value, cookie_patterns):  # noqa: E501
-                        matches.append(f"cookies:{cookie_name}")
-
-            # Meta
-            if meta and "meta" in tech_data:
-                for meta_name, meta_patterns in tech_data["meta"].items():
-                    meta_value = meta.get(meta_name, "")
-                    if meta_value:
-                        matched, version = self._check_pattern_with_version(meta_value, meta_patterns)  # noqa: E501
-                        if matched:
-                            matches.append(f"meta:{meta_name}")
-                            if version:
-                                versions.add(version)
-
-            # DNS
-            if dns and "dns" in tech_data:
-                for record_type, record_patterns in tech_data["dns"].items():
-                    record_values = dns.get(record_type.upper(), [])
-                    for record_value in record_values:
-                        if self._check_pattern(record_value, record_patterns):
-                            matches.append(f"dns:{record_type}")
-
-            # Certificate issuer
-            if certIssuer and "certIssuer" in tech_data:
-                if self._check_pattern(certIssuer, tech_data["certIssuer"]):
-                    matches.append("certIssuer")
-
-            if matches:
-                confidence = min(len(matches) * 10, 100)
-                self.detected[tech_name] = {
-                    "versions": list(versions),
-                    "confidence": confidence,
-                    "matches": matches,
-                    "categories": tech_data.get("cats", []),
+    # Pattern helpers ------------------------------------------------
+    @staticmethod
+    def _strip_wappalyzer_pattern(pattern: str) -> str:
+        return _SEMI_RE.sub("", pattern)
+
+    @classmethod
+    def _compile_technologies(
+        cls, technologies: Dict[str, Any]
+    ) -> Dict[str, _TechPatterns]:
+        """Precompile the pattern fields of every technology.
+
+        Flat fields map to a compiled pattern list; keyed fields (headers,
+        cookies, meta) are flattened into (name, tag, regex, template)
+        entries, with header names lowercased and cookie templates dropped.
+        """
+        compiled: Dict[str, _TechPatterns] = {}
+        for tech_name, tech_data in technologies.items():
+            if not isinstance(tech_data, dict):
+                continue
+            fields: Dict[str, Any] = {
+                field: cls._compile_patterns(tech_data.get(field))
+                for field in _FLAT_FIELDS
+            }
+            for field in _KEYED_FIELDS:
+                by_name = {
+                    name.lower() if field == "headers" else name: patterns
+                    for name, patterns in (tech_data.get(field) or {}).items()
                 }
+                # Cookies are match-only: their patterns never report versions.
+                versioned = field != "cookies"
+                entries: KeyedPatterns = []
+                for name, patterns in by_name.items():
+                    tag = sys.intern(f"{field}:{name}")
+                    for regex, template in cls._compile_patterns(patterns):
+                        entries.append(
+                            (name, tag, regex, template if versioned else None)
+                        )
+                fields[field] = entries
+            fields["dns"] = [
+                (
+                    record_type,
+                    sys.intern(f"dns:{record_type}"),
+                    cls._compile_patterns(patterns),
+                )
+                for record_type, patterns in (tech_data.get("dns") or {}).items()
+            ]
+            # Interned: the names are the keys of every detection dict.
+            compiled[sys.intern(tech_name)] = _TechPatterns(**fields)
+        return compiled
+
+    @classmethod
+    def _compile_patterns(cls, patterns: Any) -> CompiledPatterns:
+        """Normalize a str/list/dict pattern spec into compiled pairs.
+
+        Invalid regexes are dropped here, once, instead of failing on every
+        analyzed input. Patterns that can be lowercased safely are compiled
+        without re.IGNORECASE, whose per-character case folding is much
+        slower, and are matched against fold_case()d text instead.
+        """
+        if not patterns:
+            return []
 
-        return self._format_results()
+        if isinstance(patterns, dict):
+            raw = [(str(p), v or None) for p, v in patterns.items()]
+        elif isinstance(patterns, str):
+            raw = [(patterns, None)]
+        elif isinstance(patterns, list):
+            raw = [(str(p), None) for p in patterns]
+        else:
+            return []
+
+        compiled: CompiledPatterns = []
+        for pattern, version_info in raw:
+            pat = cls._strip_wappalyzer_pattern(pattern)
+            folded_pat = case_folded_pattern(pat)
+            regex: Optional[Pattern[str]] = None
+            if folded_pat is not None:
+                try:
+                    regex = re.compile(folded_pat)
+                except re.error:
+                    pass
+            try:
+                if regex is None:
+                    regex = re.compile(pat, re.IGNORECASE)
+            except re.error as exc:
+                logger.debug("Skipping invalid pattern %r: %s", pat, exc)
+                continue
+            compiled.append((regex, cls._parse_version_template(version_info, regex)))
+        return compiled
 
-    # Pattern helpers ------------------------------------------------
     @staticmethod
-    def _strip_wappalyzer_pattern(pattern: str) -> str:
-        return re.sub(r"\\;.*$", "", pattern)
+    def _parse_version_template(
+        version_info: Optional[str], regex: Pattern[str]
+    ) -> Optional[VersionTemplate]:
+        """Split a version template once so matches only join its parts.
+
+        Templates are only applied to regexes with capture groups; a
+        reference to a group the regex does not have stays literal text.
+        """
+        if not version_info or not regex.groups:
+            return None
+        parts: List[Union[str, int]] = [""]
+        for i, part in enumerate(_TEMPLATE_RE.split(str(version_info))):
+            if i % 2 == 0:
+                parts[-1] += part
+            elif 1 <= int(part) <= regex.groups:
+                parts.extend((int(part), ""))
+            else:
+                parts[-1] += f"\\{part}"
+        # Literal parts are interned, so a version without group references
+        # is one shared string however often it is reported.
+        return tuple(sys.intern(p) if isinstance(p, str) else p for p in parts)
 
-    def _check_pattern(self, text: str, patterns: Any) -> bool:
-        if not text or not patterns:
-            return False
+    @staticmethod
+    def _iter_compiled(
+        tech: _TechPatterns,
+    ) -> Iterator[Tuple[Pattern[str], Optional[VersionTemplate]]]:
+        """Yield every compiled pattern pair of one technology."""
+        for field in _FLAT_FIELDS:
+            yield from getattr(tech, field)
+        for field in _KEYED_FIELDS:
+            for _, _, regex, template in getattr(tech, field):
+                yield regex, template
+        for _, _, patterns in tech.dns:
+            yield from patterns
+
+    @classmethod
+    def _iter_patterns(cls, tech: _TechPatterns) -> Iterator[Pattern[str]]:
+        """Yield every compiled regex of one technology, across all fields."""
+        for regex, _ in cls._iter_compiled(tech):
+            yield regex
+
+    def _candidate_technologies(
+        self,
+        url: str,
+        html: str,
+        script_srcs: List[str],
+        headers: Dict[str, str],
+        cookies: Dict[str, str],
+        scripts: List[str],
+        meta: Dict[str, str],
+        dns: Dict[str, List[str]],
+        certIssuer: str,
+    ) -> Optional[Set[str]]:
+        """Return technologies whose literals occur in the inputs, or None.
+
+        None means no literal index is available and every technology has
+        to be checked.
+        """
+        if self._literal_index is None:
+            return None
+
+        texts: List[str] = [url, html, certIssuer]
+        texts.extend(scripts)
+        texts.extend(script_srcs)
+        texts.extend(headers.values())
+        texts.extend(cookies.values())
+        texts.extend(meta.values())
+        for values in dns.values():
+            texts.extend(values)
+        return self._literal_index.candidates(
+            text for text in texts if isinstance(text, str)
+        )
 
-        if isinstance(patterns, str):
-            patterns = [patterns]
-        elif isinstance(patterns, dict):
-            patterns = list(patterns.keys())
-        elif not isinstance(patterns, list):
+    def _load_accelerators(self) -> None:
+        """Set up the optional prefilters, reusing the on-disk cache.
+
+        Building the Hyperscan databases and literal index dominates
+        detector start-up, so their state is cached next to the
+        fingerprints, keyed by a hash of the patterns actually compiled
+        (not of technologies.json, which may have changed since it was
+        loaded) and the accelerator library versions.
+        """
+        self._prefilters: Dict[str, HyperscanPrefilter] = {}
+        self._literal_index = None
+        signature = cache_signature()
+        key: Optional[str] = None
+        if signature:
+            digest = self._patterns_digest()
+            key = hashlib.sha256(
+                f"{_ACCELERATOR_CACHE_VERSION}|{sys.version_info[:2]}|"
+                f"{signature}|{digest}".encode("utf-8")
+            ).hexdigest()[:24]
+            state = load_compiled_cache(key)
+            if state is not None:
+                try:
+                    self._restore_accelerators(state)
+                    return
+                except Exception as exc:
+                    logger.warning("Ignoring unusable compiled cache: %s", exc)
+
+        self._prefilters = self._build_prefilters(self._compiled)
+        self._literal_index = build_literal_index(
+            {
+                tech_name: list(self._iter_patterns(tech))
+                for tech_name, tech in self._compiled.items()
+            }
+        )
+        if key:
+            save_compiled_cache(
+                key,
+                {
+                    "prefilters": {
+                        field: prefilter.to_state()
+                        for field, prefilter in self._prefilters.items()
+                    },
+                    "literal_index": self._literal_index,
+                    "tech_names": self._tech_names,
+                },
+            )
+
+    def _patterns_digest(self) -> str:
+        """Hash the technology names and compiled patterns, field by field."""
+        digest = hashlib.sha256()
+        for tech_name, tech in self._compiled.items():
+            fields = [
+                [(regex.pattern, regex.flags) for regex, _ in getattr(tech, field)]  # noqa: E501
+                for field in _PREFILTER_FIELDS
+            ]
+            fields.append([(regex.pattern, regex.flags) for regex in self._iter_patterns(tech)])  # noqa: E501
+            digest.update(repr((tech_name, fields)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _restore_accelerators(self, state: Dict[str, Any]) -> None:
+        """Restore prefilters saved by _load_accelerators()."""
+        if state.get("tech_names") != self._tech_names:
+            raise ValueError("cached state covers different technologies")
+        compiled = {
+            (regex.pattern, regex.flags): regex
+            for tech in self._compiled.values()
+            for regex in self._iter_patterns(tech)
+        }
+        self._prefilters = {
+            field: HyperscanPrefilter.from_state(field_state, compiled)
+            for field, field_state in state["prefilters"].items()
+        }
+        self._literal_index = state["literal_index"]
+
+    @staticmethod
+    def _build_prefilters(compiled: Dict[str, _TechPatterns]) -> Dict[str, Any]:
+        """Build one optional multi-pattern prefilter per bulk-text field."""
+        prefilters: Dict[str, Any] = {}
+        for field in _PREFILTER_FIELDS:
+            prefilter = build_prefilter(
+                regex
+                for tech in compiled.values()
+                for regex, _ in getattr(tech, field)
+            )
+            if prefilter is not None:
+                prefilters[field] = prefilter
+        return prefilters
+
+    def _live_patterns(
+        self,
+        field: str,
+        text: str,
+        cache: Dict[Tuple[str, str], Optional[Set[Pattern[str]]]],
+    ) -> Optional[Set[Pattern[str]]]:
+        """Return the patterns of `field` that may match `text`, or None."""
+        prefilter = self._prefilters.get(field)
+        if prefilter is None or not text:
+            return None
+        key = (field, text)
+        if key not in cache:
+            cache[key] = prefilter.candidates(text)
+        return cache[key]
+
+    @staticmethod
+    def _check_pattern(
+        text: str,
+        patterns: CompiledPatterns,
+        live: Optional[Set[Pattern[str]]] = None,
+        folded: Optional[str] = None,
+    ) -> bool:
+        if not text:
             return False
+        if folded is None:
+            folded = fold_case(text)
 
-        for pattern in patterns:
-            pat = self._strip_wappalyzer_pattern(str(pattern))
-            try:
-                if re.search(pat, text, re.IGNORECASE):
-                    return True
-            except re.error:
+        for regex, _ in patterns:
+            if live is not None and regex not in live:
                 continue
+            if regex.search(text if regex.flags & _IGNORECASE else folded):
+                return True
         return False
 
-    def _check_pattern_with_version(self, text: str, patterns: Any) -> Tuple[bool, Optional[str]]:
-        if not text or not patterns:
-            return False, None
-
-        if isinstance(patterns, dict):
-            for pattern, version_info in patterns.items():
-                pat = self._strip_wappalyzer_pattern(pattern)
-                try:
-                    match = re.search(pat, text, re.IGNORECASE)
-                except re.error:
-                    continue
-                if match:
-                    if match.groups() and version_info:
-                        version = version_info
-                        for i, group in enumerate(match.groups(), 1):
-                            if group:
-                                version = version.replace(f"\\{i}", group)
-                        return True, version
-                    return True, None
+    @staticmethod
+    def _check_pattern_with_version(
+        text: str,
+        patterns: CompiledPatterns,
+        live: Optional[Set[Pattern[str]]] = None,
+        folded: Optional[str] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        if not text:
             return False, None
+        if folded is None:
+            folded = fold_case(text)
 
-        if isinstance(patterns, str):
-            patterns = [patterns]
-
-        for pattern in patterns:
-            pat = self._strip_wappalyzer_pattern(str(pattern))
-            try:
-                if re.search(pat, text, re.IGNORECASE):
-                    return True, None
-            except re.error:
+        for regex, template in patterns:
+            if live is not None and regex not in live:
                 continue
+            match = regex.search(text if regex.flags & _IGNORECASE else folded)
+            if match:
+                if template is None:
+                    return True, None
+                return True, TechDetector._render_version(template, match, text)
         return False, None
 
+    @staticmethod
+    def _render_version(
+        template: VersionTemplate, match: Match[str], text: str
+    ) -> str:
+        """Fill a version template from `match` of `text`.
+
+        Groups that did not participate in the match render as "".
+        """
+        if len(template) == 1:
+            return template[0]  # type: ignore[return-value]
+        parts = list(template)
+        if match.re.flags & _IGNORECASE:
+            parts[1::2] = [match.group(i) or "" for i in template[1::2]]
+        else:
+            # The match ran on fold_case(text), which keeps offsets, so the
+            # version is sliced from the original text with its case intact.
+            parts[1::2] = [
+                text[match.start(i):match.end(i)] if match.start(i) >= 0 else ""
+                for i in template[1::2]
+            ]
+        return "".join(parts)  # type: ignore[arg-type]
+
+    def _tech_labels(self, tech_name: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Return a technology's category and group names, memoized.
+
+        Both only depend on the fingerprint data, not on the inputs.
+        """
+        labels = self._labels.get(tech_name)
+        if labels is not None:
+            return labels
+
+        categories: List[str] = []
+        group_ids: set[Any] = set()
+        for cat_id in self.technologies.get(tech_name, {}).get("cats", []):
+            cat_key = str(cat_id)
+            if cat_key in self._category_names:
+                categories.append(self._category_names[cat_key])
+                group_ids.update(self._category_groups[cat_key])
+
+        groups = [
+            self._group_names[str(grp_id)]
+            for grp_id in group_ids
+            if str(grp_id) in self._group_names
+        ]
+        labels = self._labels[tech_name] = (tuple(categories), tuple(groups))
+        return labels
+
     def _format_results(self) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
 
         for tech_name, data in self.detected.items():
-            tech_info = self.technologies.get(tech_name, {})
-
-            result: Dict[str, Any] = {
-                "name": tech_name,
-                "confidence": data["confidence"],
-                "versions": data["versions"],
-                "categories": [],
-                "groups": [],
-            }
-
-            cat_ids = tech_info.get("cats", [])
-            group_ids: set[int] = set()
-
-            for cat_id in cat_ids:
-                cat_id_str = str(cat_id)
-                cat_info = self.categories.get(cat_id_str)
-                if isinstance(cat_info, dict):
-                    cat_name = cat_info.get("name", f"Category {cat_id}")
-                    result["categories"].append(cat_name)
-                    for grp_id in cat_info.get("groups", []):
-                        group_ids.add(grp_id)
-
-            for grp_id in group_ids:
-                grp_id_str = str(grp_id)
-                grp_info = self.groups.get(grp_id_str)
-                if isinstance(grp_info, dict):
-                    grp_name = grp_info.get("name", f"Group {grp_id}")
-                    result["groups"].append(grp_name)
-
-            results.append(result)
+            categories, groups = self._tech_labels(tech_name)
+            results.append(
+                {
+                    "name": tech_name,
+                    "confidence": data["confidence"],
+                    "versions": data["versions"],
+                    "categories": list(categories),
+                    "groups": list(groups),
+                }
+            )
 
         results.sort(key=lambda x: x["confidence"], reverse=True)
         return results
@@ -299,11 +850,14 @@ def detect_technologies(
     certIssuer: str = "",
     har_path: Optional[str] = None,
     json_data: Optional[Dict[str, Any]] = None,
+    har_data: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """Detect technologies from various inputs.
 
-    If `har_path` is provided, it takes precedence. Otherwise, either pass
-    `json_data` shaped like HAR-derived inputs or the direct keyword args.
+    If `har_path` is provided, it takes precedence, followed by `har_data`
+    (a `parse_har_file` result, used as is so a HAR already in memory is
+    not read again). Otherwise, either pass `json_data` shaped like
+    HAR-derived inputs or the direct keyword args.
     """
     global _GLOBAL_DETECTOR
     if _GLOBAL_DETECTOR is None:
@@ -313,6 +867,8 @@ def detect_technologies(
 
     if har_path:
         return detector.analyze_har(har_path)
+    if har_data is not None:
+        return detector.analyze_har_data(har_data)
     if json_data is not None:
         return detector.analyze_json(json_data)
 
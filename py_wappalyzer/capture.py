@@ -10,12 +10,15 @@ from __future__ import annotations
 import logging
 import os
 import re
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Runs of characters not allowed in capture file name slugs.
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
 
 def capture_har_with_patchright(
     url: str,
@@ -92,9 +95,12 @@ def build_capture_paths(
     screenshot_dir: Optional[Path] = None,
 ) -> Tuple[Path, Optional[Path]]:
     """Generate dated paths for HAR (and optional screenshot) under project data."""
-    ts = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-    slug = re.sub(r"[^a-z0-9]+", "-", url.lower()).strip("-") or "capture"
-    day = datetime.utcnow().strftime("%Y/%m/%d")
+    # One UTC timestamp for both, so the day directory and the file name
+    # cannot disagree across midnight.
+    now = time.gmtime()
+    ts = time.strftime("%Y%m%d-%H%M%S", now)
+    slug = _SLUG_RE.sub("-", url.lower()).strip("-") or "capture"
+    day = time.strftime("%Y/%m/%d", now)
 
     base_har_dir = har_dir or Path(
         os.getenv(
@@ -17,6 +17,7 @@ from typing import Iterable, List, Optional
 from .analyzer import detect_technologies
 from .data_loader import ensure_fingerprint_data
 from .capture import build_capture_paths, capture_har_with_patchright
+from .daemon import request_analysis, serve
 
 LOG = logging.getLogger(__name__)
 
@@ -37,6 +38,11 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         "--url",
         help="URL to visit with Patchright and capture a HAR from.",
     )
+    input_group.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a warm detector daemon on a Unix socket; later runs forward to it.",
+    )
 
     parser.add_argument(
         "--screenshot",
@@ -103,7 +109,15 @@ def _write_output(payload: str, path: Optional[Path]) -> None:
 def run(argv: Optional[Iterable[str]] = None) -> int:
     args = parse_args(argv)
     _configure_logging(args.verbose)
-    ensure_fingerprint_data(force=args.refresh_data)
+
+    if args.serve:
+        ensure_fingerprint_data(force=args.refresh_data)
+        try:
+            serve()
+        except RuntimeError as exc:
+            LOG.error("%s", exc)
+            return 1
+        return 0
 
     har_path: Optional[Path] = None
 
@@ -130,7 +144,12 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
             LOG.error("Failed to capture HAR with Patchright: %s", exc)
             return 1
 
-    results = detect_technologies(har_path=str(har_path))
+    # A running daemon already holds compiled fingerprints; otherwise (or
+    # when refreshing the data) analyze inline.
+    results = None if args.refresh_data else request_analysis(har_path)
+    if results is None:
+        ensure_fingerprint_data(force=args.refresh_data)
+        results = detect_technologies(har_path=str(har_path))
 
     if args.format == "json":
         payload = json.dumps(results, indent=2)
@@ -0,0 +1,212 @@
+"""
+Warm detector daemon for repeated CLI runs.
+
+Building a `TechDetector` (loading and compiling every fingerprint) costs
+far more than analyzing one HAR. `serve()` keeps a single warm detector in
+a long-running process listening on a Unix socket; the CLI forwards HAR
+analyses to it when the socket exists and falls back to analyzing inline
+otherwise.
+
+Protocol: one JSON line per connection, `{"har_path": "/abs/path.har",
+"data_dir": "...", "technologies_digest": "..."}`, answered with one JSON
+line, `{"results": [...]}` or `{"error": "..."}`. The daemon refuses
+requests made for other fingerprint data than it loaded (another
+`WAPPALYZER_DATA_DIR`, or a technologies.json refreshed since it started),
+so the client analyzes those inline instead of getting stale results.
+
+The socket lives at `$XDG_RUNTIME_DIR/py-wappalyzer.sock` by default;
+override with `WAPPALYZER_SOCKET`. Clients only talk to a socket owned by
+the current user, so another user cannot impersonate the daemon at a
+predictable fallback path under the temp directory.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from . import data_loader
+from .analyzer import TechDetector
+
+logger = logging.getLogger(__name__)
+
+SOCKET_NAME = "py-wappalyzer.sock"
+# Seconds a client waits for the daemon before analyzing inline instead.
+REQUEST_TIMEOUT = 120.0
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path for the current user."""
+    override = os.getenv("WAPPALYZER_SOCKET")
+    if override:
+        return Path(override)
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / SOCKET_NAME
+    # No per-user runtime dir: keep sockets of different users apart.
+    return Path(tempfile.gettempdir()) / f"py-wappalyzer-{os.getuid()}.sock"
+
+
+def _owned_socket(path: Path) -> bool:
+    """Tell whether `path` is a socket (not a link) owned by this user."""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_DetectorServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:  # liveness probe, see _daemon_running()
+            return
+        reply: Dict[str, Any]
+        try:
+            request = json.loads(line)
+            har_path = str(request["har_path"])
+            mismatch = _data_mismatch(request)
+            if mismatch:
+                reply = {"error": mismatch}
+            else:
+                reply = {"results": self.server.detector.analyze_har(har_path)}
+        except Exception as exc:
+            logger.warning("Daemon request failed: %s", exc)
+            reply = {"error": str(exc)}
+        try:
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        except OSError as exc:  # client gave up (timeout) or went away
+            logger.debug("Could not send daemon reply: %s", exc)
+
+
+def _data_mismatch(request: Dict[str, Any]) -> Optional[str]:
+    """Describe how the client's fingerprint data differs from ours."""
+    data_dir = str(data_loader.DATA_DIR)
+    if request.get("data_dir", data_dir) != data_dir:
+        return f"daemon serves fingerprints from {data_dir}"
+    digest = request.get("technologies_digest")
+    if digest and digest != data_loader.loaded_technologies_digest():
+        return "daemon fingerprints are out of date; restart it"
+    return None
+
+
+class _DetectorServer(socketserver.UnixStreamServer):
+    """Serve requests one at a time: the detector is not thread-safe."""
+
+    def __init__(self, path: Path, detector: TechDetector) -> None:
+        self.detector = detector
+        super().__init__(str(path), _Handler)
+
+
+def _daemon_running(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(path: Optional[Path] = None) -> None:
+    """Run the daemon in the foreground until interrupted.
+
+    Parameters
+    ----------
+    path: Optional[Path]
+        Socket path; defaults to `socket_path()`.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("The detector daemon needs Unix domain sockets.")
+
+    path = path or socket_path()
+    if os.path.lexists(path):
+        if not _owned_socket(path):
+            raise RuntimeError(f"{path} exists and is not a socket owned by this user")  # noqa: E501
+        if _daemon_running(path):
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        try:
+            path.unlink()  # stale socket from a daemon that did not shut down
+        except OSError as exc:
+            raise RuntimeError(f"Cannot remove stale socket {path}: {exc}") from exc  # noqa: E501
+
+    detector = TechDetector()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Only the owning user may connect.
+    old_umask = os.umask(0o177)
+    try:
+        server = _DetectorServer(path, detector)
+    finally:
+        os.umask(old_umask)
+
+    logger.info("Detector daemon listening on %s", path)
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Detector daemon stopped")
+    finally:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def request_analysis(
+    har_path: Union[str, Path],
+    *,
+    path: Optional[Path] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Optional[List[Dict[str, Any]]]:
+    """Analyze a HAR with a running daemon.
+
+    Returns None when no daemon is reachable (or it failed), in which case
+    the caller should analyze inline. A socket owned by another user is
+    treated as no daemon, and a daemon serving other fingerprint data
+    (see the module docstring) answers with an error.
+
+    Parameters
+    ----------
+    har_path: Union[str, Path]
+        HAR file to analyze; resolved to an absolute path, since the daemon
+        runs from its own working directory.
+    path: Optional[Path]
+        Socket path; defaults to `socket_path()`.
+    timeout: float
+        Seconds to wait for the daemon.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = path or socket_path()
+    if not _owned_socket(path):
+        return None
+
+    request = json.dumps(
+        {
+            "har_path": str(Path(har_path).resolve()),
+            "data_dir": str(data_loader.DATA_DIR),
+            "technologies_digest": data_loader.technologies_digest(),
+        }
+    )
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(request.encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                reply = json.loads(f.readline())
+    except (OSError, ValueError) as exc:
+        logger.debug("Detector daemon unavailable at %s: %s", path, exc)
+        return None
+
+    if "error" in reply:
+        logger.warning("Detector daemon error: %s", reply["error"])
+        return None
+    return reply.get("results")
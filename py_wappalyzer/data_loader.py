@@ -7,20 +7,30 @@ then falls back to remote URLs (enthec/webappanalyzer data set).
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Optional
 from urllib.error import URLError, HTTPError
 from urllib.request import urlopen
 
+try:  # pragma: no cover - optional dependency (speedups extra)
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # In-memory caches
 TECHNOLOGIES_CACHE: dict[str, dict[str, Any]] | None = None
 CATEGORIES_CACHE: dict[str, Any] | None = None
 GROUPS_CACHE: dict[str, Any] | None = None
+# sha256 of the technologies.json bytes behind TECHNOLOGIES_CACHE.
+TECHNOLOGIES_DIGEST: str | None = None
 
 # Default locations
 REMOTE_BASE = (
@@ -34,10 +44,26 @@ TECHNOLOGIES_JSON_PATH = DATA_DIR / "technologies.json"
 CATEGORIES_JSON_PATH = DATA_DIR / "categories.json"
 GROUPS_JSON_PATH = DATA_DIR / "groups.json"
 _DATA_READY = False
+# Concurrent requests used when fetching the technology shards remotely.
+DOWNLOAD_WORKERS = 16
+# Serialized analyzer accelerators live next to the fingerprints as
+# compiled-<key>.pickle; see load_compiled_cache().
+COMPILED_CACHE_PREFIX = "compiled-"
 
 
-def _load_json_file(path: Path) -> dict[str, Any] | None:
-    """Load a JSON file if it exists, else return None.
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, with orjson when available.
+
+    Both parsers take the raw bytes directly, skipping a separate
+    decode-to-str pass over multi-MB technology files.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json_file(path: Path) -> tuple[Any, bytes] | None:
+    """Load a JSON file if it exists, returning the data and its bytes.
 
     Parameters
     ----------
@@ -46,29 +72,99 @@ def _load_json_file(path: Path) -> dict[str, Any] | None:
     """
     try:
         if path.exists():
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            raw = path.read_bytes()
+            return _json_loads(raw), raw
     except Exception as exc:
         logger.warning("Failed to load %s: %s", path, exc)
     return None
 
 
+def _load_json_file(path: Path) -> dict[str, Any] | None:
+    """Load a JSON file if it exists, else return None.
+
+    Parameters
+    ----------
+    path: Path
+        File path to load.
+    """
+    loaded = _read_json_file(path)
+    return loaded[0] if loaded else None
+
+
 def _save_json_file(path: Path, data: dict[str, Any]) -> None:
     """Persist JSON data to a path, creating parent dirs."""
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(data))
+            return
         with path.open("w", encoding="utf-8") as f:
             json.dump(data, f)
     except Exception as exc:
         logger.warning("Failed to write %s: %s", path, exc)
 
 
+def technologies_digest() -> str | None:
+    """Return the sha256 hex digest of the local technologies.json, if any."""
+    try:
+        return hashlib.sha256(TECHNOLOGIES_JSON_PATH.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def loaded_technologies_digest() -> str | None:
+    """Return the technologies_digest() of the data load_technologies() read.
+
+    Unlike technologies_digest(), this does not change when the file is
+    replaced after the data was loaded.
+    """
+    return TECHNOLOGIES_DIGEST
+
+
+def _compiled_cache_path(key: str) -> Path:
+    return DATA_DIR / f"{COMPILED_CACHE_PREFIX}{key}.pickle"
+
+
+def load_compiled_cache(key: str) -> Any | None:
+    """Load cached compiled analyzer state for `key`, else return None.
+
+    The cache is written by this package into the (trusted) data directory,
+    the same place the fingerprint regexes themselves are read from.
+    """
+    path = _compiled_cache_path(key)
+    try:
+        if path.exists():
+            with path.open("rb") as f:
+                return pickle.load(f)  # nosec - local cache we wrote
+    except Exception as exc:
+        logger.warning("Failed to load %s: %s", path, exc)
+    return None
+
+
+def save_compiled_cache(key: str, state: Any) -> None:
+    """Persist compiled analyzer state and drop caches for other keys."""
+    path = _compiled_cache_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob(f"{COMPILED_CACHE_PREFIX}*.pickle"):
+            if stale != path:
+                stale.unlink()
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+    except Exception as exc:
+        logger.warning("Failed to write %s: %s", path, exc)
+
+
 def ensure_fingerprint_data(force: bool = False) -> None:
     """Ensure fingerprint data exists locally; optionally force refresh."""
     global TECHNOLOGIES_CACHE, CATEGORIES_CACHE, GROUPS_CACHE, _DATA_READY
+    global TECHNOLOGIES_DIGEST
 
     if force:
         TECHNOLOGIES_CACHE = None
+        TECHNOLOGIES_DIGEST = None
         CATEGORIES_CACHE = None
         GROUPS_CACHE = None
         try:
@@ -85,9 +181,15 @@ def ensure_fingerprint_data(force: bool = False) -> None:
     if _DATA_READY:
         return
 
-    load_groups()
-    load_categories()
-    load_technologies()
+    # The three loaders touch separate caches/files; fetching them together
+    # overlaps the network round-trips on a cold (or forced) refresh.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(loader)
+            for loader in (load_groups, load_categories, load_technologies)
+        ]
+        for future in futures:
+            future.result()
     _DATA_READY = True
 
 
@@ -103,9 +205,7 @@ def _download_json(url: str, timeout: float = 15.0) -> dict[str, Any] | None:
     """
     try:
         with urlopen(url, timeout=timeout) as resp:  # nosec - controlled URLs
-            charset = resp.headers.get_content_charset() or "utf-8"
-            raw = resp.read().decode(charset, errors="ignore")
-            return json.loads(raw)
+            return _json_loads(resp.read())
     except (HTTPError, URLError, TimeoutError) as exc:
         logger.error("Failed to download %s: %s", url, exc)
     except json.JSONDecodeError as exc:
@@ -152,13 +252,14 @@ def load_technologies() -> dict[str, dict[str, Any]]:
     `technologies.json` exists locally we use it, otherwise we fetch and merge
     the alphabet shard files from the remote.
     """
-    global TECHNOLOGIES_CACHE
+    global TECHNOLOGIES_CACHE, TECHNOLOGIES_DIGEST
     if TECHNOLOGIES_CACHE is not None:
         return TECHNOLOGIES_CACHE
 
-    local = _load_json_file(TECHNOLOGIES_JSON_PATH)
-    if isinstance(local, dict):
-        TECHNOLOGIES_CACHE = local  # type: ignore[assignment]
+    loaded = _read_json_file(TECHNOLOGIES_JSON_PATH)
+    if loaded and isinstance(loaded[0], dict):
+        TECHNOLOGIES_CACHE = loaded[0]
+        TECHNOLOGIES_DIGEST = hashlib.sha256(loaded[1]).hexdigest()
         return TECHNOLOGIES_CACHE
 
     logger.warning(
@@ -168,14 +269,17 @@ def load_technologies() -> dict[str, dict[str, Any]]:
 
     all_techs: dict[str, dict[str, Any]] = {}
     alphabet_files = ["_.json"] + [f"{c}.json" for c in "abcdefghijklmnopqrstuvwxyz"]
-    for filename in alphabet_files:
-        url = f"{REMOTE_BASE}/technologies/{filename}"
-        data = _download_json(url)
-        if isinstance(data, dict):
-            all_techs.update(data)
+    urls = [f"{REMOTE_BASE}/technologies/{filename}" for filename in alphabet_files]
+    # Shards are independent round-trips; fetch them concurrently. map()
+    # yields in shard order so the merged dict keeps alphabetical order.
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        for data in executor.map(_download_json, urls):
+            if isinstance(data, dict):
+                all_techs.update(data)
 
     if all_techs:
         _save_json_file(TECHNOLOGIES_JSON_PATH, all_techs)
+        TECHNOLOGIES_DIGEST = technologies_digest()
 
     TECHNOLOGIES_CACHE = all_techs
     return TECHNOLOGIES_CACHE
@@ -6,16 +6,86 @@ This module is independent and can be used directly.
 """
 from __future__ import annotations
 
-import base64
 import json
 import logging
+import mmap
+import os
+import re
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup
+from lxml import etree
+
+try:  # pragma: no cover - optional dependency (speedups extra)
+    import pybase64 as _b64
+except ImportError:  # pragma: no cover - optional dependency
+    import base64 as _b64
+
+try:  # pragma: no cover - optional dependency (speedups extra)
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:  # pragma: no cover - optional dependency (speedups extra)
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Decode errors of the streaming parser that warrant a non-streaming retry.
+_STREAM_ERRORS = (ijson.JSONError,) if ijson is not None else ()
+
+# HARs larger than this are streamed with ijson (when installed) even if
+# orjson is available: orjson parses faster but needs the whole document,
+# bodies included, in memory at once.
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+# URL suffixes of script entries whose mime type does not say JavaScript.
+_JS_SUFFIXES = (".js", ".mjs", ".cjs")
+
+# Bytes fed to the incremental HTML parser per step.
+HTML_FEED_CHUNK = 64 * 1024
+# Characters of each inline script kept for matching.
+SCRIPT_TEXT_LIMIT = 500
+
+# Fast path for <meta>/<script> extraction: a bounded tokenizer that
+# follows the HTML tokenizer rules for tags, comments and raw-text elements
+# without building a tree. Anything it does not model exactly (character
+# references, unterminated markup, foreign content, markup inside raw text)
+# makes it give up, and lxml parses the page instead. Possessive
+# quantifiers keep it linear; they need Python 3.11.
+_WS = "\t\n\f\r "
+_SPECIAL_TAGS = (
+    "meta|script|style|xmp|iframe|noembed|noframes|title|textarea|plaintext|svg|math"
+)
+_TAG_BODY = r"""(?:[^>"']++|"[^"]*+"|'[^']*+')*+"""
+_HTML_TOKEN_RE = (
+    re.compile(
+        # Text and ordinary tags, skipped in a single match.
+        rf"(?:[^<]++|</?(?!(?:{_SPECIAL_TAGS})[{_WS}/>])[a-z][^{_WS}/>]*+{_TAG_BODY}>"
+        r"|<(?![!?/a-z]))++"
+        r"|(?P<comment><!--(?:-?>|.*?--!?>)|<!(?!--)[^>]*+>|<\?[^>]*+>|</(?:>|[^a-z>][^>]*+>))"
+        rf"|<(?P<end>/?)(?P<tag>{_SPECIAL_TAGS})(?=[{_WS}/>])(?P<attrs>{_TAG_BODY})>"
+        r"|(?P<bad><)",
+        re.S | re.I | re.A,
+    )
+    if sys.version_info >= (3, 11)
+    else None
+)
+_HTML_ATTR_RE = re.compile(
+    rf"[{_WS}/]*([^{_WS}/>\"'=<]+)"
+    rf"(?:[{_WS}]*=[{_WS}]*(?:\"([^\"]*)\"|'([^']*)'|([^{_WS}\"'=<>`]+)))?"
+)
+_HTML_ATTR_TAIL_RE = re.compile(rf"[{_WS}/]*")
+_RAW_END_RE = {
+    name: re.compile(rf"</{name}(?=[{_WS}/>])[^>]*>", re.I | re.A)
+    for name in (
+        "script", "style", "xmp", "iframe", "noembed", "noframes", "title", "textarea"
+    )
+}
+
 EMPTY_HAR_RESULT: Dict[str, Any] = {
     "url": "",
     "html": "",
@@ -26,6 +96,218 @@ EMPTY_HAR_RESULT: Dict[str, Any] = {
 }
 
 
+def _orjson_load_mapped(f: BinaryIO) -> Any:
+    """Decode a JSON file with orjson straight from a read-only memory map,
+    skipping the copy of the whole file into a bytes object."""
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # empty or unmappable file
+        return _orjson_loads(f.read())
+    with mm, memoryview(mm) as view:
+        return _orjson_loads(view)
+
+
+def _orjson_loads(raw: Any) -> Any:
+    """orjson.loads that falls back to the stdlib on documents orjson is
+    stricter about (lone surrogate escapes, NaN/Infinity)."""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(bytes(raw))
+
+
+def _iter_har_entries(
+    f: BinaryIO, *, stream: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """Yield `log.entries` of a HAR file.
+
+    Uses orjson on a memory map of the file when installed (no read copy
+    and no separate decode step), else the stdlib parser. With ijson
+    installed and `stream` set, very large HARs (or any HAR when orjson is
+    missing) are streamed one entry at a time instead, so the whole file
+    never has to be held in memory at once.
+    """
+    if stream and ijson is not None and (
+        orjson is None or os.fstat(f.fileno()).st_size > STREAM_MIN_BYTES
+    ):
+        yield from ijson.items(f, "log.entries.item")
+        return
+    har_data = _orjson_load_mapped(f) if orjson is not None else json.load(f)
+    yield from har_data.get("log", {}).get("entries", [])
+
+
+def _meta_entry(attrs: Any) -> Optional[Tuple[str, str]]:
+    name = attrs.get("name") or attrs.get("property") or attrs.get("http-equiv")
+    content_val = attrs.get("content")
+    if name and content_val:
+        return name, content_val
+    return None
+
+
+class _MetaScriptTarget:
+    """lxml parser target collecting meta tags and inline scripts.
+
+    The parser reports tags and text through these callbacks instead of
+    building a document tree, so memory stays flat however large the page
+    is. Only the first `SCRIPT_TEXT_LIMIT` characters of a script are kept.
+    """
+
+    def __init__(self) -> None:
+        self.meta: Dict[str, str] = {}
+        self.scripts: List[str] = []
+        # Text of the inline script being read, None outside of one.
+        self._script: Optional[List[str]] = None
+        self._script_len = 0
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == "meta":
+            entry = _meta_entry(attrib)
+            if entry:
+                self.meta[entry[0]] = entry[1]
+        elif tag == "script":
+            self._script = None if attrib.get("src") else []
+            self._script_len = 0
+
+    def end(self, tag: str) -> None:
+        if tag == "script" and self._script is not None:
+            text = "".join(self._script)[:SCRIPT_TEXT_LIMIT]
+            if text:
+                self.scripts.append(text)
+            self._script = None
+
+    def data(self, data: str) -> None:
+        if self._script is not None and self._script_len < SCRIPT_TEXT_LIMIT:
+            self._script.append(data)
+            self._script_len += len(data)
+
+    def close(self) -> Tuple[Dict[str, str], List[str]]:
+        return self.meta, self.scripts
+
+
+def _parse_html(html: str) -> Tuple[Dict[str, str], List[str]]:
+    """Return the meta tags and inline scripts of `html`, parsed with lxml.
+
+    The page is fed in chunks to a parser with a `_MetaScriptTarget`, so no
+    tree is built. The text is already decoded; it is fed as UTF-8 with a
+    fixed encoding so that `<meta charset>` or XML declarations cannot
+    re-decode it.
+    """
+    target = _MetaScriptTarget()
+    parser = etree.HTMLParser(target=target, encoding="utf-8", huge_tree=True)
+    data = html.encode("utf-8", "replace")
+    try:
+        for start in range(0, len(data), HTML_FEED_CHUNK):
+            parser.feed(data[start:start + HTML_FEED_CHUNK])
+        return parser.close()
+    except etree.LxmlError as exc:
+        logger.debug("Could not parse HTML: %s", exc)
+        return target.meta, target.scripts
+
+
+def _parse_tag_attrs(text: str) -> Optional[Dict[str, str]]:
+    attrs: Dict[str, str] = {}
+    pos = 0
+    while True:
+        m = _HTML_ATTR_RE.match(text, pos)
+        if m is None:
+            break
+        pos = m.end()
+        value = m.group(2) or m.group(3) or m.group(4) or ""
+        attrs.setdefault(m.group(1).lower(), value)
+    if _HTML_ATTR_TAIL_RE.fullmatch(text, pos) is None:
+        return None
+    return attrs
+
+
+def _scan_html(html: str) -> Optional[Tuple[Dict[str, str], List[str]]]:
+    """Return the meta tags and inline scripts of `html` without a parser.
+
+    Returns None when the page uses markup the tokenizer does not model;
+    the caller then falls back to `_parse_html`.
+    """
+    if _HTML_TOKEN_RE is None or "\0" in html:
+        return None
+    if "\r" in html:
+        html = html.replace("\r\n", "\n").replace("\r", "\n")
+
+    meta: Dict[str, str] = {}
+    scripts: List[str] = []
+    foreign = 0  # open <svg>/<math> elements
+    pos, size = 0, len(html)
+    while pos < size:
+        m = _HTML_TOKEN_RE.match(html, pos)
+        if m is None:
+            return None
+        pos = m.end()
+        kind = m.lastgroup
+        if kind is None or kind == "comment":
+            continue
+        if kind == "bad":
+            return None
+
+        tag = m.group("tag").lower()
+        if tag in ("svg", "math"):
+            if m.group("end"):
+                foreign = max(foreign - 1, 0)
+            elif not m.group("attrs").rstrip(_WS).endswith("/"):
+                foreign += 1
+            continue
+        if m.group("end"):
+            continue
+        attrs = _parse_tag_attrs(m.group("attrs"))
+        if attrs is None or tag == "plaintext":
+            return None
+
+        if tag == "meta":
+            # Values are used as is, so character references need lxml.
+            if foreign or "&" in m.group("attrs"):
+                return None
+            entry = _meta_entry(attrs)
+            if entry:
+                meta[entry[0]] = entry[1]
+            continue
+
+        end = _RAW_END_RE[tag].search(html, pos)
+        if end is None or '"' in end.group() or "'" in end.group():
+            return None
+        text = html[pos:end.start()]
+        pos = end.end()
+        if tag == "script":
+            if foreign or "<!--" in text:
+                return None
+            if not attrs.get("src") and text:
+                scripts.append(text[:SCRIPT_TEXT_LIMIT])
+        elif "<" in text:
+            return None
+    return meta, scripts
+
+
+def _scan_entries(
+    entries: Iterator[Dict[str, Any]],
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[str]]:
+    """Return the first entry, the first HTML entry and the script URLs.
+
+    Every other entry is dropped once inspected.
+    """
+    first_entry: Dict[str, Any] | None = None
+    html_entry: Dict[str, Any] | None = None
+    script_candidates: List[str] = []
+    add_script = script_candidates.append
+    for entry in entries:
+        if first_entry is None:
+            first_entry = entry
+        content = (entry.get("response") or {}).get("content") or {}
+        mime = (content.get("mimeType") or "").lower()
+        if html_entry is None and "html" in mime:
+            html_entry = entry
+
+        # Scripts from entries
+        url = (entry.get("request") or {}).get("url") or ""
+        if "javascript" in mime or url.endswith(_JS_SUFFIXES):
+            add_script(url)
+    return first_entry, html_entry, script_candidates
+
+
 def parse_har_file(har_path: Union[str, Path]) -> Dict[str, Any]:
     """Parse a HAR file and return normalized inputs.
 
@@ -40,27 +322,32 @@ def parse_har_file(har_path: Union[str, Path]) -> Dict[str, Any]:
         Dictionary with keys: url, html, headers, cookies, scripts, meta.
     """
     try:
-        with Path(har_path).open("r", encoding="utf-8") as f:
-            har_data = json.load(f)
+        with Path(har_path).open("rb") as f:
+            try:
+                first_entry, html_entry, script_candidates = _scan_entries(
+                    _iter_har_entries(f)
+                )
+            except _STREAM_ERRORS as exc:
+                # ijson rejects some JSON the stdlib accepts (e.g. NaN):
+                # start over without streaming.
+                logger.debug(
+                    "Streaming %s failed (%s); re-reading it whole", har_path, exc
+                )
+                f.seek(0)
+                first_entry, html_entry, script_candidates = _scan_entries(
+                    _iter_har_entries(f, stream=False)
+                )
     except Exception as exc:
         logger.error("Failed to parse HAR %s: %s", har_path, exc)
         return EMPTY_HAR_RESULT.copy()
 
     result = EMPTY_HAR_RESULT.copy()
 
-    entries: List[Dict[str, Any]] = har_data.get("log", {}).get("entries", [])
-    if not entries:
+    if first_entry is None:
         return result
 
-    main_entry: Dict[str, Any] = next(
-        (
-            e
-            for e in entries
-            if "html"
-            in e.get("response", {}).get("content", {}).get("mimeType", "").lower()
-        ),
-        entries[0],
-    )
+    main_is_html = html_entry is not None
+    main_entry: Dict[str, Any] = html_entry or first_entry
 
     request_obj = main_entry.get("request", {})
     response_obj = main_entry.get("response", {})
@@ -91,46 +378,19 @@ def parse_har_file(har_path: Union[str, Path]) -> Dict[str, Any]:
     if text:
         if content.get("encoding") == "base64":
             try:
-                text = base64.b64decode(text).decode("utf-8", errors="ignore")
+                text = _b64.b64decode(text, validate=False).decode("utf-8", errors="ignore")
             except Exception:
                 pass
         result["html"] = text
 
-    # Scripts from entries
-    script_candidates: List[str] = []
-    for entry in entries:
-        req = entry.get("request", {})
-        url = req.get("url", "") or ""
-        mime = entry.get("response", {}).get("content", {}).get("mimeType", "") or ""
-        if "javascript" in mime.lower() or url.endswith(".js"):
-            script_candidates.append(url)
-
-    # Inline scripts + meta from HTML
-    if result["html"]:
-        try:
-            soup = BeautifulSoup(result["html"], "lxml")
-        except Exception:
-            soup = BeautifulSoup(result["html"], "html.parser")
-
-        meta: Dict[str, str] = {}
-        for tag in soup.find_all("meta"):
-            name = tag.get("name") or tag.get("property") or tag.get("http-equiv")
-            content_val = tag.get("content")
-            if name and content_val:
-                meta[name] = content_val
-        result["meta"] = meta
-
-        for s in soup.find_all("script"):
-            if not s.get("src") and s.string:
-                script_candidates.append(s.string[:500])
-
-    # Dedupe scripts
-    seen: set[str] = set()
-    scripts_unique: List[str] = []
-    for s in script_candidates:
-        if s not in seen:
-            seen.add(s)
-            scripts_unique.append(s)
-    result["scripts"] = scripts_unique
+    # Inline scripts + meta from HTML. Without an HTML entry the body is the
+    # first response (JSON, images, ...): keep it, but do not parse it.
+    if main_is_html and result["html"]:
+        extracted = _scan_html(result["html"]) or _parse_html(result["html"])
+        result["meta"], inline_scripts = extracted
+        script_candidates.extend(inline_scripts)
+
+    # Dedupe scripts, keeping first-seen order
+    result["scripts"] = list(dict.fromkeys(script_candidates))
 
     return result
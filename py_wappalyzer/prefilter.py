@@ -0,0 +1,461 @@
+"""
+Optional multi-pattern prefilters for the analyzer.
+
+The detector always confirms matches (and extracts versions) with Python's
+`re`; a prefilter only narrows down which technologies and compiled
+patterns are worth running against the inputs:
+
+- LiteralIndex: an Aho-Corasick automaton (pyahocorasick) over literal
+  substrings every match of a pattern must contain, used to skip whole
+  technologies whose literals do not occur anywhere in the inputs.
+- HyperscanPrefilter: a Hyperscan scan of a text against many regexes.
+
+It also holds the case-folding helpers shared with the analyzer, which
+runs patterns that are safe to lowercase against `fold_case()`d text
+instead of using `re.IGNORECASE`.
+
+Both dependencies are optional: when one is not installed the matching
+prefilter is not built and every technology/pattern is tried as before.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from importlib import metadata
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+try:  # pragma: no cover - optional dependency
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover - older Pythons
+    import sre_constants  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+# (pattern source, flags) identifies a compiled regex in serialized state.
+PatternKey = Tuple[str, int]
+
+# Patterns are compiled into several databases of this size rather than
+# one: Hyperscan rejects a whole compile on a single unsupported expression
+# without saying which one, and a failing chunk is cheaper to bisect than
+# the full pattern set.
+_DB_CHUNK = 512
+
+# Shorter literals occur in almost every page and filter out nothing.
+_MIN_LITERAL_LEN = 3
+
+# Non-ASCII characters that `re.IGNORECASE` treats as equal to an ASCII
+# letter (e.g. the Kelvin sign and "k"); folded before lowercasing so an
+# indexed ASCII literal is still found wherever its pattern could match.
+_IGNORECASE_FOLD = {0x130: "i", 0x131: "i", 0x17F: "s", 0x212A: "k"}
+
+# Uppercase ASCII letters outside of escapes and the "P" of named groups.
+_UPPER_RE = re.compile(r"\\.|\(\?P|[A-Z]+", re.DOTALL)
+
+# An unescaped "{,": `re` reads "{,n}" as a quantifier, Hyperscan as text.
+_OPEN_MIN_RE = re.compile(r"\\.|\{,", re.DOTALL)
+
+# `re`'s \s also covers \x1c-\x1f, which Hyperscan's UCP \s does not.
+_SPACE_CATEGORIES = (
+    sre_constants.CATEGORY_SPACE,
+    sre_constants.CATEGORY_NOT_SPACE,
+)
+
+
+class _UnsafeFold(Exception):
+    """Raised when a pattern cannot be matched against lowercased text."""
+
+
+def fold_case(text: str) -> str:
+    """Lowercase `text` the way `re.IGNORECASE` compares it to ASCII.
+
+    The result always has the same length as `text`, so match offsets in
+    the folded text are valid offsets into the original.
+    """
+    if not text.isascii():
+        text = text.translate(_IGNORECASE_FOLD)
+    return text.lower()
+
+
+def _fold_code(code: int) -> int:
+    if 65 <= code <= 90:
+        return code + 32
+    if code > 127:
+        raise _UnsafeFold
+    return code
+
+
+def _fold_range(low: int, high: int) -> Tuple[int, int]:
+    if high > 127:
+        raise _UnsafeFold
+    if high < 65 or low > 90:
+        return low, high
+    if 65 <= low and high <= 90:
+        return low + 32, high + 32
+    # e.g. [0-z]: lowercasing the bounds would change the set it matches.
+    raise _UnsafeFold
+
+
+def _fold_value(value: Any, fold: bool) -> Any:
+    if isinstance(value, sre_parse.SubPattern):
+        return tuple(_fold_item(op, av, fold) for op, av in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_fold_value(item, fold) for item in value)
+    return value
+
+
+def _fold_item(op: Any, av: Any, fold: bool) -> Tuple[Any, Any]:
+    """Normalize one parsed regex node, lowercasing it when `fold` is set."""
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL):
+        return op, _fold_code(av) if fold else av
+    if op is sre_constants.RANGE:
+        return op, _fold_range(*av) if fold else av
+    if op is sre_constants.IN:
+        # A set: the parser drops duplicate items, e.g. in [A-Za-z].
+        return op, frozenset(_fold_item(item_op, item_av, fold) for item_op, item_av in av)  # noqa: E501
+    if op is sre_constants.SUBPATTERN and fold:
+        group, add_flags, del_flags, pattern = av
+        # (?-i:...) is case-sensitive and (?a:...) narrows case folding;
+        # lowercasing the text would change what either matches.
+        if del_flags & re.IGNORECASE or add_flags & (re.ASCII | re.LOCALE):
+            raise _UnsafeFold
+    return op, _fold_value(av, fold)
+
+
+def case_folded_pattern(pattern: str) -> Optional[str]:
+    """Rewrite `pattern` to match `fold_case()`d text without IGNORECASE.
+
+    Uppercase literals and A-Z class ranges are lowercased. Returns None
+    when the rewrite cannot be proven equivalent (non-ASCII patterns,
+    ranges spanning both cases, scoped flags, escapes that spell an
+    uppercase character), in which case the pattern has to keep using
+    `re.IGNORECASE`.
+    """
+    if not pattern.isascii():
+        return None
+    lowered = _UPPER_RE.sub(
+        lambda m: m.group() if m.group()[0] in "\\(" else m.group().lower(),
+        pattern,
+    )
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+        if parsed.state.flags & (re.ASCII | re.LOCALE):
+            return None
+        expected = _fold_value(parsed, True)
+        if lowered != pattern and _fold_value(sre_parse.parse(lowered), False) != expected:  # noqa: E501
+            return None
+    except (_UnsafeFold, re.error, RecursionError):
+        return None
+    return lowered
+
+
+def _diverges_item(op: Any, av: Any) -> bool:
+    """Tell whether one parsed regex node may read differently in Hyperscan."""
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL):
+        return av > 127
+    if op is sre_constants.RANGE:
+        return av[1] > 127
+    if op is sre_constants.CATEGORY:
+        return av in _SPACE_CATEGORIES
+    if op is sre_constants.AT:
+        return av is sre_constants.AT_END_STRING
+    if op is sre_constants.IN:
+        return any(_diverges_item(item_op, item_av) for item_op, item_av in av)
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, del_flags, _ = av
+        # The scan runs on folded text, so case-sensitive groups could miss.
+        if del_flags & re.IGNORECASE or add_flags & re.VERBOSE:
+            return True
+    return _diverges_value(av)
+
+
+def _diverges_value(value: Any) -> bool:
+    if isinstance(value, sre_parse.SubPattern):
+        return any(_diverges_item(op, av) for op, av in value)
+    if isinstance(value, (list, tuple)):
+        return any(_diverges_value(item) for item in value)
+    return False
+
+
+def _hyperscan_divergent(regex: Pattern[str]) -> bool:
+    """Tell whether Hyperscan may not match a superset of what `regex` does.
+
+    Hyperscan reads PCRE syntax, which differs from `re` in a few places:
+    "{,n}" is a literal, \\s and \\S leave out \\x1c-\\x1f, and case
+    folding and word boundaries disagree on some non-ASCII characters.
+    Patterns using any of those (plus \\Z, scoped verbose mode and
+    case-sensitive groups) are reported so they are always run with `re`.
+    """
+    if regex.flags & re.VERBOSE or not regex.pattern.isascii():
+        return True
+    if any(m.group() == "{," for m in _OPEN_MIN_RE.finditer(regex.pattern)):
+        return True
+    try:
+        return _diverges_value(sre_parse.parse(regex.pattern, regex.flags))
+    except Exception:  # pragma: no cover - already compiled by `re`
+        return True
+
+
+def _required_runs(parsed: Any) -> List[str]:
+    """Collect literal runs that every match of a parsed regex contains.
+
+    Only the top-level sequence, plain groups and repeats with a minimum of
+    at least one are followed; branches, optional parts, classes and
+    lookarounds end the current run and contribute nothing.
+    """
+    runs: List[str] = []
+    run: List[str] = []
+    for op, av in parsed:
+        if op is sre_constants.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        if run:
+            runs.append("".join(run))
+            run = []
+        if op is sre_constants.SUBPATTERN:
+            runs.extend(_required_runs(av[-1]))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            runs.extend(_required_runs(av[2]))
+    if run:
+        runs.append("".join(run))
+    return runs
+
+
+def required_literal(regex: Pattern[str]) -> Optional[str]:
+    """Return the longest lowercase literal every match of `regex` contains.
+
+    None means no usable literal could be extracted, so the pattern has to
+    be tried on every input.
+    """
+    try:
+        runs = _required_runs(sre_parse.parse(regex.pattern, regex.flags))
+    except Exception:  # pragma: no cover - already compiled by `re`
+        return None
+    literal = max(runs, key=len, default="")
+    return literal if len(literal) >= _MIN_LITERAL_LEN else None
+
+
+class LiteralIndex:
+    """Map literal substrings to the technologies that require them.
+
+    A technology is indexed only if every one of its patterns has a
+    required literal; it can then only match when at least one of those
+    literals occurs in the inputs. Technologies with any literal-free
+    pattern are always returned as candidates.
+    """
+
+    def __init__(self, tech_patterns: Dict[str, List[Pattern[str]]]) -> None:
+        self._always: Set[str] = set()
+        by_literal: Dict[str, List[str]] = {}
+        literal_cache: Dict[Pattern[str], Optional[str]] = {}
+
+        for tech_name, patterns in tech_patterns.items():
+            literals: Set[str] = set()
+            for regex in patterns:
+                if regex not in literal_cache:
+                    literal_cache[regex] = required_literal(regex)
+                literal = literal_cache[regex]
+                if literal is None:
+                    self._always.add(tech_name)
+                    break
+                literals.add(literal)
+            else:
+                for literal in literals:
+                    by_literal.setdefault(literal, []).append(tech_name)
+
+        self._automaton = ahocorasick.Automaton()
+        for literal_id, (literal, tech_names) in enumerate(by_literal.items()):
+            self._automaton.add_word(literal, (literal_id, tuple(tech_names)))
+        if by_literal:
+            self._automaton.make_automaton()
+        self._indexed = bool(by_literal)
+        logger.debug(
+            "Literal index: %d literals, %d technologies always checked",
+            len(by_literal),
+            len(self._always),
+        )
+
+    def candidates(self, texts: Iterable[str]) -> Set[str]:
+        """Return technology names that may match any of `texts`."""
+        found = set(self._always)
+        haystack = "\n".join(text for text in texts if text)
+        if not self._indexed or not haystack:
+            return found
+
+        seen: Set[int] = set()
+        for _, (literal_id, tech_names) in self._automaton.iter(fold_case(haystack)):
+            if literal_id not in seen:
+                seen.add(literal_id)
+                found.update(tech_names)
+        return found
+
+
+class HyperscanPrefilter:
+    """Scan a text once against many regexes with a Hyperscan database.
+
+    Expressions are compiled in prefilter mode, which approximates
+    constructs Hyperscan cannot match exactly (backreferences, lookarounds)
+    with a superset, and scanned against `fold_case()`d text. Only patterns
+    whose syntax both engines read the same way are compiled; the ones
+    `_hyperscan_divergent()` flags, and those Hyperscan refuses altogether,
+    are kept in an always-run set. Skipping a pattern is therefore safe as
+    far as those checks go, not proven equivalent for arbitrary syntax.
+    """
+
+    def __init__(self, patterns: Iterable[Pattern[str]]) -> None:
+        self._flags = (
+            hyperscan.HS_FLAG_CASELESS
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_UCP
+            | hyperscan.HS_FLAG_PREFILTER
+            | hyperscan.HS_FLAG_SINGLEMATCH
+        )
+        self._always: Set[Pattern[str]] = set()
+
+        candidates: List[Pattern[str]] = []
+        for regex in dict.fromkeys(patterns):
+            # Patterns matching the empty string can match anywhere and
+            # Hyperscan refuses them; always run those with `re`, as well
+            # as patterns Hyperscan would read differently.
+            if regex.search("") is not None or _hyperscan_divergent(regex):
+                self._always.add(regex)
+            else:
+                candidates.append(regex)
+
+        self._databases: List[Tuple[Any, List[Pattern[str]]]] = []
+        for start in range(0, len(candidates), _DB_CHUNK):
+            self._add_chunk(candidates[start:start + _DB_CHUNK])
+        logger.debug(
+            "Hyperscan prefilter: %d databases, %d patterns always checked",
+            len(self._databases),
+            len(self._always),
+        )
+
+    def candidates(self, text: str) -> Set[Pattern[str]]:
+        """Return the patterns that may match `text`."""
+        live = set(self._always)
+        if not text:
+            return live
+
+        # Hyperscan's caseless mode does not equate "i" with "\u0130" and
+        # "\u0131" the way `re.IGNORECASE` does; folding the text does.
+        # "replace" keeps lone surrogates from producing invalid UTF-8.
+        data = fold_case(text).encode("utf-8", "replace")
+        for db, patterns in self._databases:
+
+            def on_match(pattern_id: int, start: int, end: int, flags: int, context: object) -> None:  # noqa: E501
+                live.add(patterns[pattern_id])
+
+            db.scan(data, match_event_handler=on_match)
+        return live
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize the compiled databases for the on-disk cache."""
+        return {
+            "always": [(regex.pattern, regex.flags) for regex in self._always],
+            "databases": [
+                (
+                    hyperscan.dumpb(db),
+                    [(regex.pattern, regex.flags) for regex in patterns],
+                )
+                for db, patterns in self._databases
+            ],
+        }
+
+    @classmethod
+    def from_state(
+        cls, state: Dict[str, Any], compiled: Dict[PatternKey, Pattern[str]]
+    ) -> "HyperscanPrefilter":
+        """Restore a prefilter from to_state() output.
+
+        `compiled` maps pattern keys to the detector's own compiled regexes
+        so restoring does not compile them a second time.
+        """
+
+        def lookup(key: PatternKey) -> Pattern[str]:
+            regex = compiled.get(key)
+            return regex if regex is not None else re.compile(*key)
+
+        prefilter = cls.__new__(cls)
+        prefilter._always = {lookup(tuple(key)) for key in state["always"]}
+        prefilter._databases = []
+        for blob, keys in state["databases"]:
+            db = hyperscan.loadb(blob, hyperscan.HS_MODE_BLOCK)
+            # Deserialized databases come without scratch space.
+            db.scratch = hyperscan.Scratch(db)
+            prefilter._databases.append((db, [lookup(tuple(key)) for key in keys]))
+        return prefilter
+
+    def _compile(self, patterns: List[Pattern[str]]) -> Any:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[regex.pattern.encode("utf-8") for regex in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=self._flags,
+        )
+        return db
+
+    def _add_chunk(self, patterns: List[Pattern[str]]) -> None:
+        """Compile a chunk, bisecting it if Hyperscan rejects a pattern."""
+        try:
+            self._databases.append((self._compile(patterns), patterns))
+            return
+        except hyperscan.error:
+            if len(patterns) == 1:
+                self._always.add(patterns[0])
+                return
+        middle = len(patterns) // 2
+        self._add_chunk(patterns[:middle])
+        self._add_chunk(patterns[middle:])
+
+
+def cache_signature() -> Optional[str]:
+    """Describe the available accelerators, or None if there are none.
+
+    Serialized prefilters are only valid for the library versions that
+    built them, so this is folded into the on-disk cache key.
+    """
+    parts = []
+    for module, dist in ((ahocorasick, "pyahocorasick"), (hyperscan, "hyperscan")):
+        if module is None:
+            continue
+        try:
+            parts.append(f"{dist}={metadata.version(dist)}")
+        except metadata.PackageNotFoundError:  # pragma: no cover - vendored
+            parts.append(f"{dist}=?")
+    return ";".join(parts) or None
+
+
+def build_literal_index(
+    tech_patterns: Dict[str, List[Pattern[str]]]
+) -> Optional[LiteralIndex]:
+    """Build a literal index, or None if pyahocorasick is missing."""
+    if ahocorasick is None:
+        return None
+    try:
+        return LiteralIndex(tech_patterns)
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.warning("Literal index unavailable: %s", exc)
+        return None
+
+
+def build_prefilter(patterns: Iterable[Pattern[str]]) -> Optional[HyperscanPrefilter]:
+    """Build a prefilter for `patterns`, or None if Hyperscan is missing."""
+    if hyperscan is None:
+        return None
+    try:
+        return HyperscanPrefilter(patterns)
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.warning("Hyperscan prefilter unavailable: %s", exc)
+        return None
@@ -4,9 +4,15 @@ from __future__ import annotations
 import json
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:  # pragma: no cover - optional dependency (speedups extra)
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 DEFAULT_DB_PATH = Path(
     os.getenv(
@@ -15,6 +21,50 @@ DEFAULT_DB_PATH = Path(
     )
 ).resolve()
 
+_INSERT_SQL = """
+    INSERT INTO detections (url, source, har_path, screenshot_path, result_json)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Applied once to every new connection.
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+"""
+
+# Connections are opened once per thread and database, and the schema is
+# checked once per database and process.
+_local = threading.local()
+_schema_ready: set[Path] = set()
+_schema_lock = threading.Lock()
+
+
+def _dump_results(results: Any) -> str:
+    """Serialize results for the `result_json` column.
+
+    The column stays TEXT (not BLOB) so existing databases and SQLite's
+    JSON functions keep working with the stored values.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(results).decode("utf-8")
+        except TypeError:  # e.g. non-string keys, which json.dumps coerces
+            pass
+    return json.dumps(results)
+
+
+def _load_results(result_json: str) -> Any:
+    """Parse a `result_json` value, falling back to the stdlib on what
+    orjson rejects (lone surrogate escapes written by json.dumps, NaN)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(result_json)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(result_json)
+
 
 def _ensure_db_exists(db_path: Path) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -40,17 +90,48 @@ def _ensure_db_exists(db_path: Path) -> None:
             conn.execute("ALTER TABLE detections ADD COLUMN har_path TEXT")
         if "screenshot_path" not in existing:
             conn.execute("ALTER TABLE detections ADD COLUMN screenshot_path TEXT")
+        # Lets list_detections walk the newest rows instead of sorting the table.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_created_at "
+            "ON detections(created_at DESC)"
+        )
         conn.commit()
 
 
+def _thread_connection(db_path: Path) -> sqlite3.Connection:
+    if db_path not in _schema_ready:
+        with _schema_lock:
+            if db_path not in _schema_ready:
+                _ensure_db_exists(db_path)
+                _schema_ready.add(db_path)
+
+    connections: Optional[Dict[Path, sqlite3.Connection]] = getattr(
+        _local, "connections", None
+    )
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        conn.executescript(_PRAGMAS)
+        connections[db_path] = conn
+    return conn
+
+
 @contextmanager
 def get_connection(db_path: Path = DEFAULT_DB_PATH) -> Iterable[sqlite3.Connection]:
-    _ensure_db_exists(db_path)
-    conn = sqlite3.connect(db_path)
+    """Yield this thread's cached connection to `db_path`.
+
+    The connection stays open for reuse; a transaction left open by an
+    exception is rolled back.
+    """
+    conn = _thread_connection(db_path)
     try:
         yield conn
-    finally:
-        conn.close()
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
 
 
 def save_detection(
@@ -63,18 +144,45 @@ def save_detection(
     db_path: Path = DEFAULT_DB_PATH,
 ) -> int:
     """Persist a detection result and return its row id."""
+    # Serialize before touching the database; the connection only does the insert.
+    result_json = _dump_results(results)
     with get_connection(db_path) as conn:
         cursor = conn.execute(
-            """
-            INSERT INTO detections (url, source, har_path, screenshot_path, result_json)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (url, source, har_path, screenshot_path, json.dumps(results)),
+            _INSERT_SQL, (url, source, har_path, screenshot_path, result_json)
         )
         conn.commit()
         return int(cursor.lastrowid)
 
 
+def save_detections(
+    entries: Sequence[Dict[str, Any]], *, db_path: Path = DEFAULT_DB_PATH
+) -> List[int]:
+    """Persist many detection results in one transaction and return their row ids.
+
+    Each entry takes the keyword arguments of `save_detection`: `url`,
+    `source`, `results` and optionally `har_path` / `screenshot_path`.
+    """
+    if not entries:
+        return []
+    rows = [
+        (
+            entry["url"],
+            entry["source"],
+            entry.get("har_path"),
+            entry.get("screenshot_path"),
+            _dump_results(entry["results"]),
+        )
+        for entry in entries
+    ]
+    with get_connection(db_path) as conn:
+        conn.executemany(_INSERT_SQL, rows)
+        # The write lock is held until commit, so AUTOINCREMENT handed out
+        # consecutive ids ending at the last one inserted.
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        conn.commit()
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
 def list_detections(
     *, limit: int = 20, db_path: Path = DEFAULT_DB_PATH
 ) -> List[Dict[str, Optional[str]]]:
@@ -95,7 +203,7 @@ def list_detections(
     for row in rows:
         row_id, url, source, har_path, screenshot_path, created_at, result_json = row
         try:
-            parsed = json.loads(result_json)
+            parsed = _load_results(result_json)
         except Exception:
             parsed = []
         results.append(
@@ -19,22 +19,32 @@ Storage layout (defaults under project data/):
 """
 from __future__ import annotations
 
+import asyncio
 import base64
+import functools
+import hmac
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from fastapi import Depends, FastAPI, HTTPException, Request, status
-    from fastapi.responses import FileResponse, HTMLResponse
+    from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, ORJSONResponse
     from fastapi.templating import Jinja2Templates
+    from jinja2 import FileSystemBytecodeCache
 except ImportError as exc:  # pragma: no cover - import guard
     raise RuntimeError(
         "FastAPI is not installed. Install with 'pip install py-wappalyzer[web]' "
         "to enable the web/API server."
     ) from exc
 
+try:  # pragma: no cover - optional dependency (speedups extra)
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 from .analyzer import detect_technologies
 from .capture import build_capture_paths, capture_har_with_patchright
 from .data_loader import ensure_fingerprint_data
@@ -51,53 +61,97 @@ SCREENSHOT_DIR = Path(
     os.getenv("WAPPALYZER_SCREENSHOT_DIR", DATA_DIR / "screenshots")
 ).resolve()
 
+# Roots `/files` may serve from, as strings for a single prefix check.
+_ALLOWED_ROOTS = tuple(str(root) for root in (CAPTURE_DIR, SCREENSHOT_DIR, DATA_DIR))
+_ALLOWED_PREFIXES = tuple(root.rstrip(os.sep) + os.sep for root in _ALLOWED_ROOTS)
+
 ensure_fingerprint_data(force=os.getenv("WAPPALYZER_REFRESH_DATA", "").lower() in {"1", "true", "yes"})
 
 api_bearer = os.getenv("WAPPALYZER_API_BEARER", "")
 basic_user = os.getenv("WAPPALYZER_WEB_USER", "")
 basic_pass = os.getenv("WAPPALYZER_WEB_PASS", "")
+# Credentials as bytes for constant-time comparison.
+_api_bearer_bytes = api_bearer.encode("utf-8")
+_basic_bytes = f"{basic_user}:{basic_pass}".encode("utf-8") if basic_user and basic_pass else b""
+
+
+def _worker_count() -> int:
+    """Read WAPPALYZER_WEB_WORKERS, falling back to the CPU count."""
+    raw = os.getenv("WAPPALYZER_WEB_WORKERS", "").strip()
+    try:
+        workers = int(raw) if raw else 0
+    except ValueError:
+        LOG.warning("Ignoring invalid WAPPALYZER_WEB_WORKERS=%r", raw)
+        workers = 0
+    return workers if workers > 0 else os.cpu_count() or 4
+
+
+# Captures and DB writes run off the event loop in this pool. It is bounded
+# so concurrent requests cannot launch an unbounded number of browsers;
+# override the size with WAPPALYZER_WEB_WORKERS.
+_WORKERS = ThreadPoolExecutor(
+    max_workers=_worker_count(),
+    thread_name_prefix="py-wappalyzer-web",
+)
+# The shared detector keeps per-analysis state, so analyses run one at a
+# time on their own thread instead of holding a _WORKERS slot while queued.
+_DETECTOR = ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="py-wappalyzer-detect",
+)
 
 templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
-app = FastAPI(title="Py-Wappalyzer", version="1.0.0")
+# Templates ship with the package and do not change while serving: skip the
+# per-request freshness check and keep compiled bytecode across restarts.
+templates.env.auto_reload = False
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+_INDEX_TPL = templates.env.get_template("index.html")
+app = FastAPI(
+    title="Py-Wappalyzer",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
+
+
+def _parse_auth(header: str) -> Tuple[str, str]:
+    """Split an Authorization header into (lowercased scheme, credentials)."""
+    scheme, _, credentials = header.partition(" ")
+    return scheme.lower(), credentials.strip()
+
+
+def _basic_matches(credentials: str) -> bool:
+    if not _basic_bytes:
+        return False
+    try:
+        decoded = base64.b64decode(credentials)
+    except Exception:
+        return False
+    return hmac.compare_digest(decoded, _basic_bytes)
 
 
 def _check_api_token(request: Request) -> None:
-    header = request.headers.get("authorization", "")
-    want_auth = bool(api_bearer or (basic_user and basic_pass))
-    if not want_auth:
+    if not (_api_bearer_bytes or _basic_bytes):
         return
 
-    if header.lower().startswith("bearer "):
-        token = header.split(" ", 1)[1].strip()
-        if api_bearer and token == api_bearer:
+    scheme, credentials = _parse_auth(request.headers.get("authorization", ""))
+    if scheme == "bearer":
+        token = credentials.encode("utf-8")
+        if _api_bearer_bytes and hmac.compare_digest(token, _api_bearer_bytes):
             return
-        if basic_user and basic_pass and token == f"{basic_user}:{basic_pass}":
+        if _basic_bytes and hmac.compare_digest(token, _basic_bytes):
             return
-
-    if header.lower().startswith("basic "):
-        try:
-            decoded = base64.b64decode(header.split(" ", 1)[1]).decode("utf-8")
-            user, pwd = decoded.split(":", 1)
-            if basic_user and basic_pass and user == basic_user and pwd == basic_pass:
-                return
-        except Exception:
-            pass
+    elif scheme == "basic" and _basic_matches(credentials):
+        return
 
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
 
 def _check_basic(request: Request) -> None:
-    if not (basic_user and basic_pass):
+    if not _basic_bytes:
+        return
+    scheme, credentials = _parse_auth(request.headers.get("authorization", ""))
+    if scheme == "basic" and _basic_matches(credentials):
         return
-    header = request.headers.get("authorization", "")
-    if header.lower().startswith("basic "):
-        try:
-            decoded = base64.b64decode(header.split(" ", 1)[1]).decode("utf-8")
-            user, pwd = decoded.split(":", 1)
-            if user == basic_user and pwd == basic_pass:
-                return
-        except Exception:
-            pass
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Unauthorized",
@@ -112,7 +166,7 @@ def health() -> Dict[str, str]:
 
 @app.get("/", response_class=HTMLResponse)
 def ui(request: Request, _=Depends(_check_basic)) -> HTMLResponse:
-    return templates.TemplateResponse("index.html", {"request": request})
+    return HTMLResponse(_INDEX_TPL.render(request=request))
 
 
 @app.get("/api/history")
@@ -120,24 +174,27 @@ def history(limit: int = 10, _=Depends(_check_api_token)) -> List[Dict[str, Any]
     return list_detections(limit=limit)
 
 
+# Media types of the files /files serves, so they need not be guessed per download.
+_MEDIA_TYPES = {
+    ".har": "application/json",
+    ".json": "application/json",
+    ".png": "image/png",
+}
+
+
+class _LargeFileResponse(FileResponse):
+    """FileResponse sent in 1 MiB chunks instead of 64 KiB ones."""
+
+    chunk_size = 1 << 20
+
+
 def _is_allowed_file(path: Path) -> bool:
     """Ensure requested file is under allowed roots."""
-    allowed_roots = [
-        CAPTURE_DIR,
-        SCREENSHOT_DIR,
-        DATA_DIR,
-    ]
     try:
-        resolved = path.resolve()
+        resolved = str(path.resolve())
     except Exception:
         return False
-    for root in allowed_roots:
-        try:
-            if root in resolved.parents or resolved == root:
-                return True
-        except Exception:
-            continue
-    return False
+    return resolved.startswith(_ALLOWED_PREFIXES) or resolved in _ALLOWED_ROOTS
 
 
 @app.get("/files")
@@ -147,11 +204,13 @@ def download_file(path: str, _=Depends(_check_api_token)) -> FileResponse:
         raise HTTPException(status_code=404, detail="File not found")
     if not candidate.exists():
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(candidate)
+    return _LargeFileResponse(
+        candidate, media_type=_MEDIA_TYPES.get(candidate.suffix.lower())
+    )
 
 
 @app.post("/api/analyze")
-def analyze(payload: Dict[str, Any], _=Depends(_check_api_token)) -> Dict[str, Any]:
+async def analyze(payload: Dict[str, Any], _=Depends(_check_api_token)) -> Dict[str, Any]:
     url = str(payload.get("url") or "").strip()
     har_path_str = str(payload.get("har_path") or "").strip()
     screenshot_flag = payload.get("screenshot")  # bool or optional path; defaults below
@@ -163,6 +222,7 @@ def analyze(payload: Dict[str, Any], _=Depends(_check_api_token)) -> Dict[str, A
     har_path: Optional[Path] = None
     screenshot_effective: Optional[Path] = None
     source: str = "har"
+    loop = asyncio.get_running_loop()
 
     try:
         if har_path_str:
@@ -182,27 +242,42 @@ def analyze(payload: Dict[str, Any], _=Depends(_check_api_token)) -> Dict[str, A
             screenshot_effective = (
                 Path(screenshot_path_input) if screenshot_path_input else auto_ss
             )
-            capture_har_with_patchright(
-                url,
-                har_path,
-                screenshot_path=screenshot_effective,
+            await loop.run_in_executor(
+                _WORKERS,
+                functools.partial(
+                    capture_har_with_patchright,
+                    url,
+                    har_path,
+                    screenshot_path=screenshot_effective,
+                ),
             )
             source = "url"
 
-        results: List[Dict[str, Any]] = detect_technologies(har_path=str(har_path))
-        record_id = save_detection(
-            url=url or har_path_str,
-            source=source,
-            results=results,
-            har_path=str(har_path) if har_path else None,
-            screenshot_path=str(screenshot_effective) if screenshot_effective else None,
+        record_url = url or har_path_str
+        har_path_out = str(har_path) if har_path else None
+        screenshot_out = str(screenshot_effective) if screenshot_effective else None
+
+        results: List[Dict[str, Any]] = await loop.run_in_executor(
+            _DETECTOR,
+            functools.partial(detect_technologies, har_path=har_path_out),
+        )
+        record_id = await loop.run_in_executor(
+            _WORKERS,
+            functools.partial(
+                save_detection,
+                url=record_url,
+                source=source,
+                results=results,
+                har_path=har_path_out,
+                screenshot_path=screenshot_out,
+            ),
         )
         return {
             "id": record_id,
-            "url": url or har_path_str,
+            "url": record_url,
             "source": source,
-            "har_path": str(har_path) if har_path else None,
-            "screenshot_path": str(screenshot_effective) if screenshot_effective else None,
+            "har_path": har_path_out,
+            "screenshot_path": screenshot_out,
             "results": results,
         }
     except HTTPException:
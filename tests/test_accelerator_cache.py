@@ -0,0 +1,121 @@
+"""Tests for the analyzer's literal index, Hyperscan prefilter and cache.
+
+The accelerators only narrow down which technologies and patterns are
+checked, so a detector using them must report exactly what a detector
+without them reports, including when their state comes from the on-disk
+cache.
+"""
+import json
+
+import pytest
+
+from py_wappalyzer import data_loader
+from py_wappalyzer.analyzer import TechDetector
+from py_wappalyzer.prefilter import cache_signature
+
+needs_accelerators = pytest.mark.skipif(
+    cache_signature() is None,
+    reason="needs pyahocorasick or hyperscan (speedups extra)",
+)
+
+CATEGORIES = {"1": {"name": "CMS", "groups": [1]}}
+GROUPS = {"1": {"name": "Content"}}
+TECHNOLOGIES = {
+    "WordPress": {
+        "cats": [1],
+        "html": r"/wp-(?:content|includes)/",
+        "meta": {"generator": r"^WordPress ([\d.]+)\;version:\1"},
+    },
+    "Spacey": {"cats": [1], "html": r"foo\sbar"},
+    "Anything": {"cats": [1], "url": r"^https?://"},
+}
+PAGES = [
+    {"html": '<link href="/wp-content/x.css">'},
+    {"html": "foo\x1fbar"},
+    {"url": "https://example.com/", "meta": {"generator": "WordPress 6.4"}},
+    {"html": "<p>brandnewmarker</p>"},
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the data loader at a fresh directory with empty caches."""
+    monkeypatch.setattr(data_loader, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(
+        data_loader, "TECHNOLOGIES_JSON_PATH", tmp_path / "technologies.json"
+    )
+    monkeypatch.setattr(data_loader, "TECHNOLOGIES_CACHE", None)
+    monkeypatch.setattr(data_loader, "CATEGORIES_CACHE", CATEGORIES)
+    monkeypatch.setattr(data_loader, "GROUPS_CACHE", GROUPS)
+    monkeypatch.setattr(data_loader, "_DATA_READY", True)
+    return tmp_path
+
+
+def _write_technologies(data_dir, technologies):
+    (data_dir / "technologies.json").write_text(json.dumps(technologies))
+
+
+def _names(detector, page):
+    return sorted(result["name"] for result in detector.analyze(**page))
+
+
+def _plain_detector():
+    """A detector with every accelerator switched off."""
+    detector = TechDetector()
+    detector._prefilters = {}
+    detector._literal_index = None
+    return detector
+
+
+def test_accelerators_do_not_change_results(data_dir):
+    """Detections with and without the prefilters are identical."""
+    _write_technologies(data_dir, TECHNOLOGIES)
+    fast = TechDetector()
+    plain = _plain_detector()
+    for page in PAGES:
+        assert _names(fast, page) == _names(plain, page), page
+
+
+@needs_accelerators
+def test_cached_state_gives_the_same_results(data_dir):
+    """A detector restored from the cache matches the one that wrote it."""
+    _write_technologies(data_dir, TECHNOLOGIES)
+    built = TechDetector()
+    assert list(data_dir.glob("compiled-*.pickle"))
+    restored = TechDetector()
+    for page in PAGES:
+        assert _names(restored, page) == _names(built, page), page
+
+
+@needs_accelerators
+def test_cache_follows_the_compiled_data(data_dir, monkeypatch):
+    """State built from stale in-memory data is not reused for new data.
+
+    A long-running process may compile data it loaded before
+    technologies.json was refreshed; a later process reading the new file
+    must not pick up accelerators that do not know the new technologies.
+    """
+    _write_technologies(data_dir, TECHNOLOGIES)
+    data_loader.load_technologies()  # the old data stays in memory
+    new_technologies = dict(TECHNOLOGIES)
+    new_technologies["BrandNewTech"] = {"cats": [1], "html": "brandnewmarker"}
+    _write_technologies(data_dir, new_technologies)
+    TechDetector()  # compiles and caches the old data
+
+    monkeypatch.setattr(data_loader, "TECHNOLOGIES_CACHE", None)
+    detector = TechDetector()
+    assert "BrandNewTech" in detector.technologies
+    assert _names(detector, {"html": "<p>brandnewmarker</p>"}) == [
+        "BrandNewTech"
+    ]
+
+
+@needs_accelerators
+def test_restore_rejects_state_for_other_technologies(data_dir):
+    """Cached state must cover exactly the detector's technologies."""
+    _write_technologies(data_dir, TECHNOLOGIES)
+    detector = TechDetector()
+    detector._tech_names = detector._tech_names + ["Unknown"]
+    state = {"prefilters": {}, "literal_index": None, "tech_names": []}
+    with pytest.raises(ValueError):
+        detector._restore_accelerators(state)
@@ -0,0 +1,113 @@
+"""Tests for matching lowercased patterns against `fold_case()`d text.
+
+`case_folded_pattern` lets the analyzer drop `re.IGNORECASE`: a rewritten
+pattern searched in `fold_case(text)` must find exactly the spans the
+original pattern finds in `text` with IGNORECASE, and patterns for which
+that cannot be guaranteed must be left alone (None).
+"""
+import re
+
+import pytest
+
+from py_wappalyzer.analyzer import TechDetector
+from py_wappalyzer.prefilter import case_folded_pattern, fold_case
+
+# Patterns the rewrite applies to.
+FOLDABLE = [
+    "WordPress",
+    "KEY",
+    r"\bWP\b",
+    r"[A-Z]+\d",
+    r"[^A]b",
+    r"jquery[.-]([\d.]+)",
+    r"\Ssl",
+    r"(?i)Abc",
+    r"(?P<Name>Ab)(?P=Name)",
+    r"x(?=Y)",
+]
+
+# Texts with the non-ASCII characters IGNORECASE equates to ASCII letters:
+# the Kelvin sign, long s and dotted/dotless i.
+TEXTS = [
+    "powered by WordPress",
+    "WORDPRESS",
+    "KEY key Key",
+    "ſsl SSL ſSL",
+    "KEY İNFO ınfo WP",
+    "abcABC xY XY",
+    "AbAb aBab",
+    "jQuery-3.7.1.min.js",
+    "Q1 [A]b ab Ab",
+]
+
+# Patterns the rewrite must refuse.
+UNSAFE = [
+    r"[0-z]x",  # the range spans both cases
+    r"[\x41-\x5A]q",  # escapes spelling uppercase bounds
+    r"\x4Bey",  # an escape spelling an uppercase letter
+    r"(?-i:Foo)bar",  # case-sensitive group
+    r"(?a:x)y",  # ASCII-only folding
+    "café",  # non-ASCII pattern
+]
+
+
+def _spans(match):
+    return [match.span(i) for i in range(match.re.groups + 1)]
+
+
+@pytest.mark.parametrize("pattern", FOLDABLE)
+def test_folded_pattern_matches_like_ignorecase(pattern):
+    """Every match and group span equals the IGNORECASE one."""
+    folded = case_folded_pattern(pattern)
+    assert folded is not None
+    expected = re.compile(pattern, re.IGNORECASE)
+    actual = re.compile(folded)
+    for text in TEXTS:
+        want = [_spans(m) for m in expected.finditer(text)]
+        got = [_spans(m) for m in actual.finditer(fold_case(text))]
+        assert got == want, text
+
+
+@pytest.mark.parametrize("pattern", UNSAFE)
+def test_unsafe_patterns_are_not_rewritten(pattern):
+    """Patterns that lowercasing could change keep IGNORECASE."""
+    assert case_folded_pattern(pattern) is None
+
+
+def test_fold_case_keeps_offsets():
+    """Folding never changes the length, so spans map back to the text."""
+    text = "İstanbul Kelvin ſign ı ẞ"
+    assert len(fold_case(text)) == len(text)
+    assert fold_case("Kſİı") == "ksii"
+
+
+def test_compiled_pattern_drops_ignorecase():
+    """The analyzer compiles foldable patterns without IGNORECASE only."""
+    (folded, _), (kept, _) = TechDetector._compile_patterns(
+        ["WordPress", r"(?-i:WP)x"]
+    )
+    assert not folded.flags & re.IGNORECASE
+    assert kept.flags & re.IGNORECASE
+
+
+def test_version_keeps_original_case():
+    """Versions are sliced from the original text, not the folded one."""
+    patterns = TechDetector._compile_patterns(
+        {r"Drupal ([\d.]+[A-Z]*)": r"\1"}
+    )
+    assert not patterns[0][0].flags & re.IGNORECASE
+    matched, version = TechDetector._check_pattern_with_version(
+        "Powered by DRUPAL 10.2RC1", patterns
+    )
+    assert matched
+    assert version == "10.2RC"
+
+
+def test_version_after_kelvin_sign():
+    """Non-ASCII text before the match does not shift the version."""
+    patterns = TechDetector._compile_patterns({r"Kit/([\w.]+)": r"\1"})
+    matched, version = TechDetector._check_pattern_with_version(
+        "Kİſ Kit/2.0Beta", patterns
+    )
+    assert matched
+    assert version == "2.0Beta"
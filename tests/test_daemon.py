@@ -0,0 +1,111 @@
+"""Tests for the warm detector daemon and its client."""
+import json
+import socket
+import threading
+
+import pytest
+
+from py_wappalyzer import daemon, data_loader
+from py_wappalyzer.analyzer import TechDetector
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets"
+)
+
+TECHNOLOGIES = {"Nginx": {"cats": [1], "headers": {"Server": "nginx"}}}
+HAR = {
+    "log": {
+        "entries": [
+            {
+                "request": {"url": "https://example.com/"},
+                "response": {
+                    "headers": [{"name": "Server", "value": "nginx"}],
+                    "content": {"mimeType": "text/html", "text": "<p>hi</p>"},
+                },
+            }
+        ]
+    }
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the data loader at a fresh directory with empty caches."""
+    path = tmp_path / "data"
+    path.mkdir()
+    (path / "technologies.json").write_text(json.dumps(TECHNOLOGIES))
+    monkeypatch.setattr(data_loader, "DATA_DIR", path)
+    monkeypatch.setattr(
+        data_loader, "TECHNOLOGIES_JSON_PATH", path / "technologies.json"
+    )
+    monkeypatch.setattr(data_loader, "TECHNOLOGIES_CACHE", None)
+    monkeypatch.setattr(data_loader, "TECHNOLOGIES_DIGEST", None)
+    monkeypatch.setattr(data_loader, "CATEGORIES_CACHE", {"1": {"name": "Web"}})
+    monkeypatch.setattr(data_loader, "GROUPS_CACHE", {})
+    monkeypatch.setattr(data_loader, "_DATA_READY", True)
+    return path
+
+
+@pytest.fixture
+def running_daemon(data_dir, tmp_path):
+    """Serve a detector on a socket under tmp_path; yield the socket path."""
+    path = tmp_path / "d.sock"
+    server = daemon._DetectorServer(path, TechDetector())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def har_file(tmp_path):
+    path = tmp_path / "page.har"
+    path.write_text(json.dumps(HAR))
+    return path
+
+
+def _names(results):
+    return [result["name"] for result in results]
+
+
+def test_daemon_answers_for_the_same_data(running_daemon, har_file):
+    """A client using the daemon's data gets its results."""
+    results = daemon.request_analysis(har_file, path=running_daemon)
+    assert _names(results) == ["Nginx"]
+
+
+def test_refreshed_data_is_analyzed_inline(
+    running_daemon, har_file, data_dir
+):
+    """After technologies.json changes, the stale daemon is not used."""
+    changed = dict(TECHNOLOGIES, Apache={"cats": [1], "html": "hi"})
+    (data_dir / "technologies.json").write_text(json.dumps(changed))
+    assert daemon.request_analysis(har_file, path=running_daemon) is None
+
+
+def test_other_data_dir_is_refused(running_daemon, har_file, tmp_path):
+    """A request made for another data directory gets an error reply.
+
+    The client and daemon share this process, so the request is sent by
+    hand rather than through request_analysis().
+    """
+    request = {
+        "har_path": str(har_file),
+        "data_dir": str(tmp_path / "other"),
+        "technologies_digest": data_loader.technologies_digest(),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(running_daemon))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            reply = json.loads(f.readline())
+    assert "results" not in reply
+    assert "error" in reply
+
+
+def test_foreign_file_is_not_a_daemon(tmp_path, har_file):
+    """A regular file at the socket path counts as no daemon."""
+    path = tmp_path / "not-a-socket"
+    path.write_text("")
+    assert daemon.request_analysis(har_file, path=path) is None
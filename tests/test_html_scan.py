@@ -0,0 +1,121 @@
+"""Tests for the regex HTML tokenizer in `py_wappalyzer.har`.
+
+`_scan_html` is a fast path for `_parse_html` (lxml): whenever it returns
+a result, that result must be exactly what lxml would have produced, and
+markup it does not model must make it return None so the caller falls
+back to lxml.
+"""
+import random
+
+import pytest
+
+from py_wappalyzer import har
+
+needs_tokenizer = pytest.mark.skipif(
+    har._HTML_TOKEN_RE is None,
+    reason="the tokenizer needs possessive quantifiers (Python 3.11+)",
+)
+
+# Documents the tokenizer handles itself, grouped by what they exercise.
+FAST_PATH_DOCS = [
+    # Meta tags: quoting, case, whitespace and duplicate attributes.
+    '<meta name="generator" content="WordPress 6.4">',
+    "<META NAME='Generator' CONTENT='Joomla!'>",
+    '<meta name=a content="x>y">',
+    '<meta name = e content = f >',
+    '<meta\tname=tab\fcontent=ff>',
+    '<meta name="dup" name="dup2" content=z>',
+    '<meta property="og:site_name" content="Example">',
+    '<meta http-equiv="X-Powered-By" content="PHP/8.2">',
+    '<meta charset=utf-8><meta content=only>',
+    "<meta name=\"q\" content='a\"b'>",
+    "<meta name=é content=é>",
+    # Comments, including the abruptly closed forms.
+    "<!-- <meta name=hidden content=1> --><meta name=shown content=2>",
+    "<!--[if IE]><script>ie()</script><![endif]-->",
+    "<!---->x<!-- a -- b -->",
+    "<!--><meta name=after content=1>",
+    "<!---><meta name=after content=1>",
+    '<!DOCTYPE html><html lang=en><head><meta charset=utf-8></head>',
+    '<?xml version="1.0"?><meta name=x content=y>',
+    "</ <meta name=be content=1>",
+    # Raw-text elements: markup inside them is text.
+    '<script>var a = "<div>";</script>',
+    "<script>if(a<b&&c>d){}</script>",
+    "<SCRIPT type=text/javascript>x()</SCRIPT >",
+    '<script src="x.js"></script><script>inline()</script>',
+    "<script src>inline</script>",
+    "<script></script>",
+    "<script>\r\nfoo\r</script>",
+    "<style>.a{}</style><title>t</title><meta name=s content=1>",
+    # Foreign content without scripts or meta tags inside.
+    '<svg><title>i</title><path d="M0"/></svg><meta name=v content=1>',
+    "<svg/><math><mi>x</mi></math><script>after()</script>",
+    # Character references stay text and are not decoded in scripts.
+    "<p>&lt;meta name=x content=1&gt;</p>",
+    "<p>caf&eacute; &#60;script&#62;</p><script>s()</script>",
+    "<script>a &amp; b</script>",
+    # Text and attributes that merely look like tags.
+    '<div title="<meta name=attr content=1>">',
+    "<a href='x>'>y</a><img alt=\"a > b\">",
+    "a < b x<3 </>",
+    "<noscript><meta name=ns content=2></noscript>",
+    "<template><meta name=tp content=1></template>",
+    "<table><meta name=tb content=1></table>",
+]
+
+# Markup the tokenizer leaves to lxml.
+FALLBACK_DOCS = [
+    '<meta name="b" content="a &amp; b">',  # reference in an attribute
+    '<script>a</script foo="b">',  # attributes on the end tag
+    "<script><!-- x --></script>",  # script data escape states
+    "<style><meta name=s content=1></style>",
+    "<title><script>x</script></title>",
+    "<title>a < b</title><meta name=t content=1>",
+    "<textarea><meta name=ta content=1></textarea>",
+    "<xmp><b></xmp>",
+    "<svg><script>s()</script></svg>",  # script in foreign content
+    "<svg><style><![CDATA[a]]></style></svg>",
+    "<meta/name=c/content=d/>",
+    "<plaintext><meta name=p content=1>",
+    "<script>never closed",
+    "<meta name=x content=y",
+    "<div",
+    "<!-- unterminated",
+    "nul\0<meta name=x content=y>",
+]
+
+
+@needs_tokenizer
+@pytest.mark.parametrize("html", FAST_PATH_DOCS)
+def test_scan_matches_lxml(html):
+    """The fast path is taken and agrees with lxml on each document."""
+    scanned = har._scan_html(html)
+    assert scanned is not None
+    assert scanned == har._parse_html(html)
+
+
+@pytest.mark.parametrize("html", FALLBACK_DOCS)
+def test_scan_falls_back(html):
+    """Unmodelled markup returns None instead of a guess."""
+    assert har._scan_html(html) is None
+
+
+@needs_tokenizer
+def test_scan_matches_lxml_on_combinations():
+    """Concatenated fragments still agree with lxml when scanned.
+
+    Mixing fragments puts tags inside each other's comments, raw text and
+    foreign content, which single documents do not cover.
+    """
+    fragments = FAST_PATH_DOCS + FALLBACK_DOCS
+    rnd = random.Random(0)
+    scanned_docs = 0
+    for _ in range(2000):
+        html = "".join(rnd.choices(fragments, k=rnd.randint(2, 8)))
+        scanned = har._scan_html(html)
+        if scanned is None:
+            continue
+        scanned_docs += 1
+        assert scanned == har._parse_html(html), html
+    assert scanned_docs
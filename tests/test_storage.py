@@ -0,0 +1,54 @@
+"""Tests for storing and reading detection results in SQLite."""
+import json
+import sqlite3
+
+from py_wappalyzer.storage import list_detections, save_detections
+
+
+def test_results_round_trip(tmp_path):
+    """Saved results come back unchanged for every row."""
+    db_path = tmp_path / "detections.db"
+    results = [{"name": "Nginx", "confidence": 100, "versions": ["1.25"]}]
+    save_detections(
+        [
+            {"url": "https://a.example", "source": "url", "results": []},
+            {"url": "https://b.example", "source": "har", "results": results},
+        ],
+        db_path=db_path,
+    )
+    by_url = {
+        row["url"]: row["results"] for row in list_detections(db_path=db_path)
+    }
+    assert by_url == {"https://a.example": [], "https://b.example": results}
+
+
+def test_results_orjson_rejects_are_read_back(tmp_path):
+    """Values only the json module writes or reads are not dropped.
+
+    A lone surrogate makes orjson refuse to serialize the results, so they
+    are stored as json.dumps escapes that orjson also refuses to parse.
+    """
+    db_path = tmp_path / "detections.db"
+    results = [{"name": "Odd", "versions": ["\ud800"]}]
+    save_detections(
+        [{"url": "https://c.example", "source": "url", "results": results}],
+        db_path=db_path,
+    )
+    (row,) = list_detections(db_path=db_path)
+    assert row["results"] == results
+
+
+def test_results_with_nan_are_read_back(tmp_path):
+    """Rows holding NaN, as older json.dumps-based writers stored them."""
+    db_path = tmp_path / "detections.db"
+    save_detections(
+        [{"url": "https://d.example", "source": "url", "results": []}],
+        db_path=db_path,
+    )
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "UPDATE detections SET result_json = ?",
+            (json.dumps([{"name": "X", "confidence": float("nan")}]),),
+        )
+    (row,) = list_detections(db_path=db_path)
+    assert row["results"][0]["name"] == "X"